@@ -0,0 +1,252 @@
+"""
+Shared CGFX parsing core for cgfx_analyzer and find_textures.
+
+Holds the tables, binary layouts and Morton untiling both scripts use, plus
+a parsed-structure cache keyed by (path, mtime) so a file analyzed more than
+once in a process is only swept once. Only the parsed structure is cached;
+file mappings are always closed after use.
+"""
+
+import bisect
+import contextlib
+import functools
+import mmap
+import os
+import re
+import struct
+from typing import NamedTuple, Optional, Tuple
+
+# Precompiled binary layouts
+CGFX_HEADER = struct.Struct('<HHIII')  # BOM, header size, version, file size, entries
+U32 = struct.Struct('<I')
+U16X2 = struct.Struct('<HH')
+
+# TXOB probe offsets and the texture sizes accepted as dimensions
+DIM_OFFSETS = (0x10, 0x14, 0x18, 0x1C, 0x20)
+FMT_OFFSETS = (0x08, 0x0C, 0x24, 0x28)
+VALID_DIMS = frozenset((32, 64, 128, 256, 512))
+
+# Bytes per texel for each PICA200 texture format
+FORMAT_BPP = {
+    0: 4,   # RGBA8
+    1: 3,   # RGB8
+    2: 2,   # RGBA5551
+    3: 2,   # RGB565
+    4: 2,   # RGBA4
+    5: 2,   # LA8
+    6: 2,   # HILO8
+    7: 1,   # L8
+    8: 1,   # A8
+    9: 1,   # LA4
+    10: 0.5, # L4
+    11: 0.5, # A4
+    12: 0.5, # ETC1 (4bpp)
+    13: 1,   # ETC1A4 (8bpp)
+}
+
+FORMAT_NAMES = {
+    0: 'RGBA8', 1: 'RGB8', 2: 'RGBA5551', 3: 'RGB565', 4: 'RGBA4',
+    5: 'LA8', 6: 'HILO8', 7: 'L8', 8: 'A8', 9: 'LA4',
+    10: 'L4', 11: 'A4', 12: 'ETC1', 13: 'ETC1A4'
+}
+
+# Bytes per texel of the formats decode_tiled can decode
+TEXEL_BYTES = {'RGBA8': 4, 'LA8': 2}
+
+# Every marker the parser looks for, in one alternation: the DATA
+# section, TXOB entries, and COMMON strings (COMMON1..COMMON5 are the
+# texture names). None of them can overlap another, so one sweep finds all.
+_MARKER_RE = re.compile(rb'(DATA|TXOB|COMMON([1-5])?)')
+
+# (x, y) inside an 8x8 tile for each Morton (Z-order) index
+MORTON_XY = tuple(
+    ((t & 1) | ((t >> 1) & 2) | ((t >> 2) & 4),
+     ((t >> 1) & 1) | ((t >> 2) & 2) | ((t >> 3) & 4))
+    for t in range(64)
+)
+
+
+class TXOB(NamedTuple):
+    """One TXOB (Texture Object) entry and the fields probed from it."""
+    pos: int
+    name: Optional[str]
+    width: int
+    height: int
+    format: int
+    expected_size: int
+
+
+class CGFXStructure(NamedTuple):
+    """Markers found in a CGFX file, all in file order."""
+    data_section: Optional[Tuple[int, int]]  # (offset, size), None if missing
+    txobs: Tuple[TXOB, ...]
+    commons: Tuple[Tuple[bytes, int], ...]   # (b'COMMONn', offset)
+
+
+def morton_index(x: int, y: int) -> int:
+    """Morton Z-order index for 8x8 tile."""
+    morton = 0
+    for i in range(3):
+        morton |= ((x >> i) & 1) << (2 * i)
+        morton |= ((y >> i) & 1) << (2 * i + 1)
+    return morton
+
+
+def read_string(data: bytes, offset: int, max_len: int = 64) -> str:
+    """Read null-terminated string from data."""
+    end = data.find(b'\x00', offset, offset + max_len)
+    if end == -1:
+        end = offset + max_len
+    return data[offset:end].decode('ascii', errors='replace')
+
+
+@contextlib.contextmanager
+def map_file(path: str):
+    """Map a file read-only instead of reading it into memory (empty files give b'')."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def iter_txob(data, txob_positions, common_positions):
+    """
+    Probe each TXOB entry for its name, dimensions and format.
+
+    common_positions must be sorted; the name is the first "COMMON" string
+    4-byte aligned to the TXOB within -128..+252 of it.
+    """
+    for pos in txob_positions:
+        name = None
+        i = bisect.bisect_left(common_positions, pos - 128)
+        while i < len(common_positions) and common_positions[i] < pos + 256:
+            test_pos = common_positions[i]
+            if (test_pos - pos) % 4 == 0 and test_pos < len(data) - 32:
+                name = read_string(data, test_pos)
+                break
+            i += 1
+
+        # Try multiple potential dimension locations
+        width = height = fmt = 0
+        for dim_off in DIM_OFFSETS:
+            if pos + dim_off + 4 > len(data):
+                continue
+            w, h = U16X2.unpack_from(data, pos + dim_off)
+            # Valid dimensions are power of 2, typical values
+            if w in VALID_DIMS and h in VALID_DIMS:
+                width, height = w, h
+                break
+
+        # Try to find format field
+        for fmt_off in FMT_OFFSETS:
+            if pos + fmt_off + 4 > len(data):
+                continue
+            f = U32.unpack_from(data, pos + fmt_off)[0]
+            # Known formats: RGBA8=0, RGB8=1, RGBA5551=2, RGB565=3, RGBA4=4,
+            # LA8=5, HILO8=6, L8=7, A8=8, LA4=9, L4=10, A4=11, ETC1=12, ETC1A4=13
+            if 0 <= f < 14:
+                fmt = f
+                break
+
+        # Calculate expected data size based on texture size
+        bpp = FORMAT_BPP.get(fmt, 4)
+        expected_size = int(width * height * bpp) if width and height else 0
+
+        yield TXOB(pos, name, width, height, fmt, expected_size)
+
+
+def parse(data) -> CGFXStructure:
+    """Find the DATA section, TXOB entries and COMMON names in one sweep."""
+    data_positions, txob_positions, commons = [], [], []
+    common_positions = []
+    for m in _MARKER_RE.finditer(data):
+        if m.group(2):
+            commons.append((m.group(), m.start()))
+            common_positions.append(m.start())
+        elif m.group() == b'DATA':
+            data_positions.append(m.start())
+        elif m.group() == b'TXOB':
+            txob_positions.append(m.start())
+        else:
+            common_positions.append(m.start())
+
+    data_section = None
+    if data_positions:
+        data_pos = data_positions[0]
+        data_size = U32.unpack_from(data, data_pos + 4)[0]
+        data_section = (data_pos, data_size)
+        # TXOB entries live inside the DATA section; the image data after
+        # it can contain the same four bytes by chance
+        txob_positions = txob_positions[:bisect.bisect_left(txob_positions, data_pos + data_size)]
+
+    txobs = tuple(iter_txob(data, txob_positions, common_positions))
+    return CGFXStructure(data_section, txobs, tuple(commons))
+
+
+@functools.lru_cache(maxsize=8)
+def parse_structure(path: str, mtime_ns: int) -> CGFXStructure:
+    """parse() a file, cached by (path, mtime); the mapping is closed after."""
+    with map_file(path) as data:
+        return parse(data)
+
+
+def load_structure(path) -> CGFXStructure:
+    """Parsed structure of a file, reused while the file is unchanged."""
+    path = str(path)
+    return parse_structure(path, os.stat(path).st_mtime_ns)
+
+
+def untile(data, width: int, height: int, bpp: int) -> bytearray:
+    """
+    Reorder Morton-tiled texels (bpp 4 or 2) into a row-major buffer.
+
+    Each strided slice copies one Morton slot out of every tile in a tile
+    row, so there is no per-pixel Python work. Pixels outside whole tiles
+    stay zero.
+    """
+    tiles_x = width // 8
+    tiles_y = height // 8
+    row_texels = tiles_x * 64
+    fmt = 'I' if bpp == 4 else 'H'
+    buf = bytearray(width * height * bpp)
+    src = memoryview(data)[:tiles_y * row_texels * bpp].cast(fmt)
+    dst = memoryview(buf).cast(fmt)
+
+    for ty in range(tiles_y):
+        tile_row = ty * row_texels
+        for t, (px, py) in enumerate(MORTON_XY):
+            d = (ty * 8 + py) * width + px
+            dst[d:d + tiles_x * 8:8] = src[tile_row + t:tile_row + row_texels:64]
+
+    return buf
+
+
+def decode_tiled(data, offset: int, width: int, height: int, fmt: str):
+    """
+    Decode an RGBA8 or LA8 Morton-tiled texture at offset into an RGBA image.
+
+    Returns None if data is too short to hold the texture's whole tiles.
+    Raises ValueError for formats other than RGBA8 and LA8.
+    """
+    from PIL import Image
+
+    if fmt not in TEXEL_BYTES:
+        raise ValueError(f"Unknown format: {fmt}")
+    bpp = TEXEL_BYTES[fmt]
+    expected = (width // 8) * (height // 8) * 64 * bpp
+
+    if offset + expected > len(data):
+        return None
+    if not expected:
+        return Image.new('RGBA', (width, height))
+
+    pixels = untile(memoryview(data)[offset:offset + expected], width, height, bpp)
+    size = (width, height)
+    if fmt == 'RGBA8':
+        # Texels are stored as A, B, G, R
+        return Image.frombuffer('RGBA', size, pixels, 'raw', 'ABGR', 0, 1)
+    # Texels are stored as A, L; load them as LA and swap the bands back
+    a, l = Image.frombuffer('LA', size, pixels, 'raw', 'LA', 0, 1).split()
+    return Image.merge('RGBA', (l, l, l, a))
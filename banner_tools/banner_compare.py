@@ -4,8 +4,14 @@ Banner Compare Tool - Compare generated banner with template and working referen
 Shows all texture regions side-by-side for visual debugging.
 """
 
+import functools
+import hashlib
+import mmap
+import os
 import struct
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -15,8 +21,20 @@ except ImportError:
     sys.exit(1)
 
 
+_FLAG_MASKS = (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01)
+
+
 def decompress_lz11(data, offset=0):
-    """Decompress LZ11 data."""
+    """Decompress LZ11 data from any buffer (bytes, mmap, memoryview...)."""
+    if isinstance(data, (bytes, bytearray)):
+        return _decompress_lz11(data, offset)
+    # The views are released on every path, errors included, so a mapped
+    # source can still be closed while an exception propagates
+    with memoryview(data) as view, view.cast('B') as flat:
+        return _decompress_lz11(flat, offset)
+
+
+def _decompress_lz11(data, offset):
     if data[offset] != 0x11:
         raise ValueError(f'Not LZ11 compressed (got 0x{data[offset]:02x})')
 
@@ -24,133 +42,254 @@ def decompress_lz11(data, offset=0):
     result = bytearray(size)
     src = offset + 4
     dst = 0
+    end = len(data)
 
-    while dst < size and src < len(data):
+    while dst < size and src < end:
         flags = data[src]
         src += 1
 
-        for bit in range(8):
-            if dst >= size or src >= len(data):
+        for mask in _FLAG_MASKS:
+            if dst >= size or src >= end:
                 break
 
-            if flags & (0x80 >> bit):
-                byte1 = data[src]
-                src += 1
-
-                if (byte1 >> 4) == 0:
-                    if src + 1 >= len(data): break
-                    byte2 = data[src]
-                    src += 1
-                    length = ((byte1 << 4) | (byte2 >> 4)) + 0x11
-                    disp = ((byte2 & 0x0F) << 8) | data[src]
-                    src += 1
-                elif (byte1 >> 4) == 1:
-                    if src + 2 >= len(data): break
-                    byte2, byte3, byte4 = data[src], data[src+1], data[src+2]
-                    src += 3
-                    length = (((byte1 & 0x0F) << 12) | (byte2 << 4) | (byte3 >> 4)) + 0x111
-                    disp = ((byte3 & 0x0F) << 8) | byte4
-                else:
-                    length = (byte1 >> 4) + 1
-                    if src >= len(data): break
-                    byte2 = data[src]
-                    src += 1
-                    disp = ((byte1 & 0x0F) << 8) | byte2
-
-                disp += 1
-                for i in range(length):
-                    if dst >= size: break
-                    result[dst] = result[dst - disp]
-                    dst += 1
-            else:
+            if not flags & mask:
                 result[dst] = data[src]
                 src += 1
                 dst += 1
+                continue
+
+            byte1 = data[src]
+            indicator = byte1 >> 4
+
+            if indicator == 0:
+                if src + 2 >= end: return bytes(result)
+                byte2 = data[src+1]
+                length = ((byte1 << 4) | (byte2 >> 4)) + 0x11
+                disp = ((byte2 & 0x0F) << 8) | data[src+2]
+                src += 3
+            elif indicator == 1:
+                if src + 3 >= end: return bytes(result)
+                byte2, byte3 = data[src+1], data[src+2]
+                length = (((byte1 & 0x0F) << 12) | (byte2 << 4) | (byte3 >> 4)) + 0x111
+                disp = ((byte3 & 0x0F) << 8) | data[src+3]
+                src += 4
+            else:
+                if src + 1 >= end: return bytes(result)
+                length = indicator + 1
+                disp = ((byte1 & 0x0F) << 8) | data[src+1]
+                src += 2
+
+            disp += 1
+            stop = min(dst + length, size)
+            if stop - dst <= disp <= dst:
+                # Source and destination don't overlap: one memmove
+                result[dst:stop] = result[dst - disp:stop - disp]
+                dst = stop
+            else:
+                while dst < stop:
+                    result[dst] = result[dst - disp]
+                    dst += 1
 
     return bytes(result)
 
 
-def decode_rgba8_texture(data, offset, width, height):
-    """Decode RGBA8 Morton-tiled texture to PIL Image."""
-    img = Image.new('RGBA', (width, height))
-    pixels = img.load()
+# (x, y) within an 8x8 tile for each Morton-ordered texel index
+_MORTON_XY = tuple(
+    ((t & 1) | ((t >> 1) & 2) | ((t >> 2) & 4),
+     ((t >> 1) & 1) | ((t >> 2) & 2) | ((t >> 3) & 4))
+    for t in range(64)
+)
 
-    pos = offset
-    tiles_x = width // 8
-    tiles_y = height // 8
 
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            for t in range(64):
-                px = (t & 1) | ((t >> 1) & 2) | ((t >> 2) & 4)
-                py = ((t >> 1) & 1) | ((t >> 2) & 2) | ((t >> 3) & 4)
+def _untile(data, offset, width, height, bpp):
+    """Reorder 8x8 Morton-tiled texels into row-major order.
+
+    Each strided slice copies one Morton slot out of every tile in a tile
+    row at once, so the work is 64 slice copies per tile row instead of a
+    Python iteration per pixel. Missing trailing data decodes as zeros.
+    """
+    assert width % 8 == 0 and height % 8 == 0, "Morton tiles require 8-pixel multiples"
+
+    tile_row = width * 8
+    size = width * height * bpp
+
+    # Read in place when the whole texture is present; pad a copy otherwise
+    if offset + size <= len(data):
+        raw = memoryview(data)[offset:offset + size]
+    else:
+        raw = bytes(data[offset:offset + size]).ljust(size, b'\0')
 
-                x = tx * 8 + px
-                y = ty * 8 + py
+    fmt = 'I' if bpp == 4 else 'H'
+    out = bytearray(size)
+    src = memoryview(raw).cast('B').cast(fmt)
+    dst = memoryview(out).cast(fmt)
 
-                if pos + 4 <= len(data):
-                    a, b, g, r = data[pos:pos+4]
-                    if x < width and y < height:
-                        pixels[x, y] = (r, g, b, a)
-                pos += 4
+    for base in range(0, width * height, tile_row):
+        for t, (px, py) in enumerate(_MORTON_XY):
+            d = base + py * width + px
+            dst[d:d + width:8] = src[base + t:base + tile_row:64]
 
-    return img
+    return out
+
+
+def decode_rgba8_texture(data, offset, width, height):
+    """Decode RGBA8 Morton-tiled texture to PIL Image."""
+    pixels = _untile(data, offset, width, height, 4)
+    # Texels are stored as A, B, G, R
+    return Image.frombuffer('RGBA', (width, height), pixels, 'raw', 'ABGR', 0, 1)
 
 
 def decode_la8_texture(data, offset, width, height):
     """Decode LA8 Morton-tiled texture to PIL Image."""
-    img = Image.new('RGBA', (width, height))
-    pixels = img.load()
+    pixels = _untile(data, offset, width, height, 2)
+    # Texels are stored as A, L; load them as LA and swap the bands back
+    a, l = Image.frombuffer('LA', (width, height), pixels, 'raw', 'LA', 0, 1).split()
+    return Image.merge('RGBA', (l, l, l, a))
+
+
+def _decompress_banner_cgfx(buf, base=0):
+    """Decompress the common CGFX of the CBMD banner starting at buf[base].
+
+    The compressed stream is read through a memoryview bounded by the LZ11
+    worst case (all literals), so buf may be a memory-mapped CIA and is
+    never copied.
+    """
+    if buf[base:base + 4] != b'CBMD':
+        raise ValueError("Not a valid banner (no CBMD header)")
+
+    start = base + struct.unpack_from('<I', buf, base + 0x08)[0]
+    header = buf[start:start + 4]
+    size = header[1] | (header[2] << 8) | (header[3] << 16) if len(header) == 4 else 0
+    end = start + 4 + size + (size + 7) // 8
 
-    tiles_x = width // 8
-    tiles_y = height // 8
-    pos = offset
+    with memoryview(buf)[start:end] as stream:
+        return decompress_lz11(stream)
 
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            for t in range(64):
-                px = (t & 1) | ((t >> 1) & 2) | ((t >> 2) & 4)
-                py = ((t >> 1) & 1) | ((t >> 2) & 2) | ((t >> 3) & 4)
 
-                x = tx * 8 + px
-                y = ty * 8 + py
+# Decompressed banner CGFX is cached here between runs
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'banner_tools'
 
-                if pos + 2 <= len(data):
-                    a, l = data[pos:pos+2]
-                    if x < width and y < height:
-                        pixels[x, y] = (l, l, l, a)
-                pos += 2
+# Most recently used cache entries kept; older ones are pruned on write
+CACHE_MAX_ENTRIES = 32
+
+# Temp files left this long (seconds) by an interrupted write are pruned
+_CACHE_TMP_MAX_AGE = 3600
+
+
+def _prune_cache():
+    """Drop all but the newest CACHE_MAX_ENTRIES entries, and stale temp files."""
+    entries = []
+    now = time.time()
+    for entry in CACHE_DIR.iterdir():
+        try:
+            mtime = entry.stat().st_mtime
+            if entry.suffix == '.cgfx':
+                entries.append((mtime, entry))
+            elif entry.suffix == '.tmp' and now - mtime > _CACHE_TMP_MAX_AGE:
+                entry.unlink()
+        except OSError:
+            pass  # Removed by a concurrent run
+
+    entries.sort(reverse=True)
+    for _, entry in entries[CACHE_MAX_ENTRIES:]:
+        try:
+            entry.unlink()
+        except OSError:
+            pass
+
+
+def _cache_cgfx(load):
+    """Cache decompressed CGFX on disk, keyed by source path, mtime and size.
+
+    Only compressed sources (.bnr/.cia) are cached. A modified source gets a
+    new key, so stale entries are never read. Reads refresh an entry's mtime
+    and writes prune the cache to the CACHE_MAX_ENTRIES most recently used.
+    Cache I/O errors are ignored.
+    """
+    @functools.wraps(load)
+    def wrapper(path):
+        path = Path(path)
+        if path.suffix.lower() not in ('.bnr', '.cia'):
+            return load(path)
+
+        st = path.stat()
+        key = hashlib.blake2b(f'{path.resolve()}:{st.st_mtime_ns}:{st.st_size}'.encode(),
+                              digest_size=16).hexdigest()
+        cache_file = CACHE_DIR / f'{key}.cgfx'
+        try:
+            cgfx = cache_file.read_bytes()
+            os.utime(cache_file)
+            return cgfx
+        except OSError:
+            pass
+
+        cgfx = load(path)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_bytes(cgfx)
+            os.replace(tmp_file, cache_file)
+            _prune_cache()
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+        return cgfx
 
-    return img
+    return wrapper
 
 
+def _align64(n):
+    return (n + 0x3F) & ~0x3F
+
+
+def _cia_banner_offset(buf):
+    """Locate the ExeFS banner of a CIA's first content by walking headers.
+
+    Layout (3dbrew): CIA header, cert chain, ticket, TMD, then content, each
+    aligned to 64 bytes; content 0 is an NCCH whose ExeFS holds 'banner'.
+    Returns None if the structure doesn't parse (e.g. encrypted content).
+    """
+    try:
+        header_size, _, _, cert_size, ticket_size, tmd_size = struct.unpack_from('<IHHIII', buf, 0)
+        ncch = _align64(_align64(_align64(_align64(header_size) + cert_size) + ticket_size) + tmd_size)
+        if buf[ncch + 0x100:ncch + 0x104] != b'NCCH':
+            return None
+
+        media_unit = 0x200 << buf[ncch + 0x18E]
+        exefs = ncch + struct.unpack_from('<I', buf, ncch + 0x1A0)[0] * media_unit
+        for i in range(10):
+            name, offset, size = struct.unpack_from('<8sII', buf, exefs + i * 16)
+            if name.rstrip(b'\0') == b'banner':
+                return exefs + 0x200 + offset
+    except (struct.error, IndexError):
+        pass
+    return None
+
+
+@_cache_cgfx
 def load_banner(path):
     """Load and decompress banner CGFX."""
     path = Path(path)
 
     if path.suffix.lower() == '.cia':
-        # Extract banner from CIA
-        cia_data = path.read_bytes()
-        cbmd_offset = cia_data.find(b'CBMD')
-        if cbmd_offset == -1:
-            raise ValueError("No CBMD header found in CIA")
-        banner = cia_data[cbmd_offset:]
+        # Extract banner from CIA without reading the whole file into memory
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            cbmd_offset = _cia_banner_offset(mm)
+            if cbmd_offset is None or mm[cbmd_offset:cbmd_offset + 4] != b'CBMD':
+                cbmd_offset = mm.find(b'CBMD')
+            if cbmd_offset == -1:
+                raise ValueError("No CBMD header found in CIA")
+            return _decompress_banner_cgfx(mm, cbmd_offset)
     elif path.suffix.lower() == '.bnr':
-        banner = path.read_bytes()
+        return _decompress_banner_cgfx(path.read_bytes())
     elif path.suffix.lower() == '.cgfx':
         # Raw uncompressed CGFX
         return path.read_bytes()
     else:
         raise ValueError(f"Unknown file type: {path.suffix}")
 
-    if banner[:4] != b'CBMD':
-        raise ValueError("Not a valid banner (no CBMD header)")
-
-    cgfx_offset = struct.unpack('<I', banner[0x08:0x0C])[0]
-    cwav_offset = struct.unpack('<I', banner[0x84:0x88])[0]
-
-    return decompress_lz11(banner, cgfx_offset)
-
 
 def analyze_cgfx(cgfx, name=""):
     """Analyze CGFX and return texture info."""
@@ -176,20 +315,30 @@ def analyze_cgfx(cgfx, name=""):
     return info
 
 
+# Per-byte threshold tables for count_colors (1 where the test holds)
+_ABOVE_200 = bytes(v > 200 for v in range(256))
+_BELOW_50 = bytes(v < 50 for v in range(256))
+_BELOW_180 = bytes(v < 180 for v in range(256))
+
+
+def _channel_mask(channel, table):
+    """Map a channel plane through a 0/1 lookup table into a bitmask int."""
+    return int.from_bytes(channel.translate(table), 'little')
+
+
 def count_colors(cgfx, start, end):
     """Count special colors in a region."""
-    red = 0
-    transparent = 0
-    green = 0
-
-    for i in range(start, min(end, len(cgfx)), 4):
-        a, b, g, r = cgfx[i:i+4]
-        if a == 0:
-            transparent += 1
-        if r > 200 and g < 50 and b < 50 and a > 200:
-            red += 1
-        if g > 200 and r < 180 and b < 180 and a > 200:
-            green += 1
+    stop = min(end, len(cgfx))
+    region = bytes(cgfx[start:stop - (stop - start) % 4]) if stop > start else b''
+
+    # Texels are stored as A, B, G, R; split them into channel planes
+    a, b, g, r = region[0::4], region[1::4], region[2::4], region[3::4]
+
+    transparent = a.count(0)
+    red = (_channel_mask(r, _ABOVE_200) & _channel_mask(g, _BELOW_50) &
+           _channel_mask(b, _BELOW_50) & _channel_mask(a, _ABOVE_200)).bit_count()
+    green = (_channel_mask(g, _ABOVE_200) & _channel_mask(r, _BELOW_180) &
+             _channel_mask(b, _BELOW_180) & _channel_mask(a, _ABOVE_200)).bit_count()
 
     total = (end - start) // 4
     return {
@@ -202,6 +351,50 @@ def count_colors(cgfx, start, end):
     }
 
 
+def load_and_analyze(path):
+    """Load a banner and collect its texture info and color counts.
+
+    Runs in a worker process from main(), so everything it needs is
+    returned rather than printed.
+    """
+    cgfx = load_banner(path)
+    name = Path(path).stem
+    info = analyze_cgfx(cgfx, name)
+    colors = {tex_name: count_colors(cgfx, start, end)
+              for tex_name, (start, end, desc) in info['textures'].items()}
+    return name, cgfx, info, colors
+
+
+# First DejaVu Sans found on this system, resolved once at import
+_FONT_PATH = next((fp for fp in [
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+] if os.path.exists(fp)), None)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_font(size):
+    """Load (once per size) the label font, or PIL's default if unavailable."""
+    if _FONT_PATH:
+        try:
+            return ImageFont.truetype(_FONT_PATH, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def _decode_cell(cgfx, region_key):
+    """Decode one comparison cell's texture and count its special pixels."""
+    if region_key == 'footer':
+        offset = 0x1AD80
+        tex = decode_la8_texture(cgfx, offset, 256, 64)
+    else:
+        offset = 0x5880
+        tex = decode_rgba8_texture(cgfx, offset, 128, 128)
+
+    return tex, count_colors(cgfx, offset, offset + 0x10000)
+
+
 def create_comparison_image(sources, output_path):
     """Create a side-by-side comparison image."""
 
@@ -219,20 +412,25 @@ def create_comparison_image(sources, output_path):
     result = Image.new('RGBA', (width, height), (40, 40, 40, 255))
     draw = ImageDraw.Draw(result)
 
-    # Try to load a font
-    try:
-        font = ImageFont.truetype("/usr/share/fonts/TTF/DejaVuSans.ttf", 14)
-        small_font = ImageFont.truetype("/usr/share/fonts/TTF/DejaVuSans.ttf", 11)
-    except:
-        font = ImageFont.load_default()
-        small_font = font
+    font = _get_font(14)
+    small_font = _get_font(11)
 
     # Draw header
     draw.text((padding, 10), "Banner Texture Comparison", fill=(255, 255, 255), font=font)
 
     y_offset = 50
-
-    for row, (region_key, region_name) in enumerate([('label_128', 'Label 128x128 (0x5880)'), ('footer', 'Footer (0x1AD80)')]):
+    regions = [('label_128', 'Label 128x128 (0x5880)'), ('footer', 'Footer (0x1AD80)')]
+
+    # Decode all cells concurrently; pasting and drawing stay on this thread
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        cells = {
+            (row, col): ex.submit(_decode_cell, cgfx, region_key)
+            for row, (region_key, region_name) in enumerate(regions)
+            for col, (name, cgfx) in enumerate(sources)
+            if len(cgfx) == 172416  # Universal VC
+        }
+
+    for row, (region_key, region_name) in enumerate(regions):
         for col, (name, cgfx) in enumerate(sources):
             x = padding + col * (cell_size + padding)
             y = y_offset + row * (128 + label_height + padding)
@@ -241,17 +439,8 @@ def create_comparison_image(sources, output_path):
             if row == 0:
                 draw.text((x, y - 25), name[:20], fill=(200, 200, 200), font=small_font)
 
-            # Extract texture
-            if len(cgfx) == 172416:  # Universal VC
-                if region_key == 'footer':
-                    offset = 0x1AD80
-                    tex = decode_la8_texture(cgfx, offset, 256, 64)
-                else:
-                    offset = 0x5880
-                    tex = decode_rgba8_texture(cgfx, offset, 128, 128)
-
-                # Count special pixels
-                colors = count_colors(cgfx, offset, offset + 0x10000)
+            if (row, col) in cells:
+                tex, colors = cells[row, col].result()
 
                 # Draw texture
                 result.paste(tex, (x, y))
@@ -310,26 +499,26 @@ def main():
         except Exception as e:
             print(f"Warning: Failed to load template: {e}")
 
-    # Load input files
-    for path in args.files:
-        try:
-            cgfx = load_banner(path)
-            name = Path(path).stem
-            sources.append((name, cgfx))
+    # Load input files in parallel; results are reported in argument order
+    with ProcessPoolExecutor(max_workers=min(len(args.files), os.cpu_count() or 1)) as ex:
+        futures = [(path, ex.submit(load_and_analyze, path)) for path in args.files]
 
-            info = analyze_cgfx(cgfx, name)
+        for path, future in futures:
+            try:
+                name, cgfx, info, colors = future.result()
+            except Exception as e:
+                print(f"Error loading {path}: {e}")
+                continue
+
+            sources.append((name, cgfx))
             print(f"\nLoaded: {path}")
             print(f"  Size: {info['size']} bytes")
             print(f"  Template: {info['template']}")
 
             for tex_name, (start, end, desc) in info['textures'].items():
-                colors = count_colors(cgfx, start, end)
                 print(f"  {desc}:")
-                print(f"    Red pixels: {colors['red']} ({colors['red_pct']:.1f}%)")
-                print(f"    Transparent: {colors['transparent']} ({colors['transparent_pct']:.1f}%)")
-
-        except Exception as e:
-            print(f"Error loading {path}: {e}")
+                print(f"    Red pixels: {colors[tex_name]['red']} ({colors[tex_name]['red_pct']:.1f}%)")
+                print(f"    Transparent: {colors[tex_name]['transparent']} ({colors[tex_name]['transparent_pct']:.1f}%)")
 
     if len(sources) >= 1:
         output = create_comparison_image(sources, args.output)
@@ -35,6 +35,7 @@ Texture locations in GBA VC banner BCMDL:
 """
 
 import os
+import re
 import sys
 import struct
 import subprocess
@@ -60,6 +61,10 @@ REGION_CODES = {
     13: 'USA_PO',
 }
 
+# Matches any region locale string (every code but COMMON)
+_LOCALE_RE = re.compile(b'|'.join(
+    re.escape(code.encode('ascii')) for code in REGION_CODES.values() if code != 'COMMON'))
+
 # Texture format codes
 TEXTURE_FORMATS = {
     0x00: 'RGBA8',
@@ -83,13 +88,15 @@ def run_3dstool(args, check=True):
     """Run 3dstool with given arguments"""
     cmd = ['3dstool'] + args
     try:
-        result = subprocess.run(cmd, check=check, capture_output=True, text=True)
+        # Only stderr is ever reported, so stdout is not buffered at all
+        result = subprocess.run(cmd, check=check,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         return result.returncode == 0
     except FileNotFoundError:
         print("Error: 3dstool not found. Please install it.")
         return False
     except subprocess.CalledProcessError as e:
-        print(f"3dstool error: {e.stderr}")
+        print(f"3dstool error: {e.stderr.decode(errors='replace')}")
         return False
 
 
@@ -112,19 +119,31 @@ def find_locale_string_offset(data, locale='USA_EN'):
     return offset
 
 
-def patch_locale_string(data, old_locale, new_locale):
-    """Replace locale string in BCMDL data"""
-    if len(old_locale) != len(new_locale):
-        # Pad with underscore or truncate
-        if len(new_locale) < len(old_locale):
-            new_locale = new_locale + '_' * (len(old_locale) - len(new_locale))
-        else:
-            new_locale = new_locale[:len(old_locale)]
+def find_locale_strings(data):
+    """
+    Find all locale strings in BCMDL data in one pass.
     
-    old_bytes = old_locale.encode('ascii')
-    new_bytes = new_locale.encode('ascii')
+    Returns {locale: [offsets]} for every region locale present.
+    """
+    found = {}
+    for m in _LOCALE_RE.finditer(data):
+        found.setdefault(m.group().decode('ascii'), []).append(m.start())
+    return found
+
+
+def patch_locale_string(data, offset, old_len, new_bytes):
+    """
+    Overwrite the old_len-byte locale string at offset in BCMDL data.
+    
+    new_bytes is padded with underscores or truncated to old_len. A
+    bytearray is patched in place and returned; other buffers are copied.
+    """
+    new_bytes = new_bytes[:old_len].ljust(old_len, b'_')
     
-    return data.replace(old_bytes, new_bytes)
+    if not isinstance(data, bytearray):
+        data = bytearray(data)
+    data[offset:offset + old_len] = new_bytes
+    return data
 
 
 def get_texture_format_offset(bcmdl_data):
@@ -150,6 +169,8 @@ def set_texture_format(bcmdl_data, new_format):
     Set texture format in BCMDL.
     
     new_format: Either format code (int) or format name (str)
+    
+    A bytearray is patched in place and returned; other buffers are copied.
     """
     if isinstance(new_format, str):
         # Look up format code
@@ -161,6 +182,9 @@ def set_texture_format(bcmdl_data, new_format):
             raise ValueError(f"Unknown format: {new_format}")
     
     offset = get_texture_format_offset(bcmdl_data)
+    if isinstance(bcmdl_data, bytearray):
+        bcmdl_data[offset] = new_format
+        return bcmdl_data
     result = bytearray(bcmdl_data)
     result[offset] = new_format
     return bytes(result)
@@ -175,34 +199,69 @@ class BCMDLEditor:
         if path:
             self.load(path)
     
+    @property
+    def data(self):
+        return self._data
+    
+    @data.setter
+    def data(self, value):
+        self._data = value
+        # Locale is rescanned lazily whenever the data is replaced
+        self._locale = None
+        self._locale_offsets = None
+    
     def load(self, path):
         """Load BCMDL file"""
         with open(path, 'rb') as f:
-            self.data = f.read()
+            # Kept mutable so locale/format patches happen in place
+            self.data = bytearray(f.read())
         self.path = path
+        self._scan_locale()
+    
+    def _scan_locale(self):
+        """Locate the locale string with a single pass over the data"""
+        found = find_locale_strings(self._data)
+        
+        # Same precedence as before: first match in REGION_CODES order
+        for locale in REGION_CODES.values():
+            if locale in found:
+                self._locale = locale
+                self._locale_offsets = found[locale]
+                return
+        self._locale = None
+        self._locale_offsets = []
     
     def save(self, path=None):
         """Save BCMDL file"""
-        path = path or self.path
-        with open(path, 'wb') as f:
-            f.write(self.data)
+        self._write_to(path or self.path)
+    
+    def _write_to(self, path):
+        """Write data to path with raw os-level calls (no file object)"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(self.data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
     
     def get_locale(self):
         """Get locale string from BCMDL"""
-        for locale in REGION_CODES.values():
-            if locale != 'COMMON':
-                offset = find_locale_string_offset(self.data, locale)
-                if offset >= 0:
-                    return locale
-        return None
+        if self._locale_offsets is None:
+            self._scan_locale()
+        return self._locale
     
     def set_locale(self, new_locale):
         """Set locale string in BCMDL"""
         old_locale = self.get_locale()
-        if old_locale:
-            self.data = patch_locale_string(self.data, old_locale, new_locale)
-            return True
-        return False
+        if not old_locale:
+            return False
+        
+        new_bytes = new_locale.encode('ascii')
+        for offset in self._locale_offsets:
+            self._data = patch_locale_string(self._data, offset, len(old_locale), new_bytes)
+        self._locale_offsets = None
+        return True
     
     def get_texture_format(self):
         """Get texture format"""
@@ -210,7 +269,9 @@ class BCMDLEditor:
     
     def set_texture_format(self, new_format):
         """Set texture format (for enabling color instead of grayscale)"""
-        self.data = set_texture_format(self.data, new_format)
+        if not isinstance(self._data, bytearray):
+            self.data = bytearray(self._data)
+        set_texture_format(self._data, new_format)
     
     def enable_color_textures(self):
         """Change from LA8 (grayscale) to ETC1A4 (color)"""
@@ -224,8 +285,6 @@ class BannerEditor:
         self.banner_path = banner_path
         self.temp_dir = None
         self.bcmdl_files = {}
-        self.cbmd_data = None
-        self.bcwav_data = None
         
         if banner_path:
             self.load(banner_path)
@@ -245,12 +304,23 @@ class BannerEditor:
                 # Extract region number from filename
                 num = int(f.replace('banner', '').replace('.bcmdl', ''))
                 self.bcmdl_files[num] = BCMDLEditor(path)
-            elif f == 'banner.cbmd':
-                with open(path, 'rb') as file:
-                    self.cbmd_data = file.read()
-            elif f == 'banner.bcwav':
-                with open(path, 'rb') as file:
-                    self.bcwav_data = file.read()
+    
+    def _read_extracted(self, name):
+        """Read an extracted file on demand (None if not present)"""
+        if not self.temp_dir:
+            return None
+        path = Path(self.temp_dir, name)
+        return path.read_bytes() if path.exists() else None
+    
+    @property
+    def cbmd_data(self):
+        """CBMD header, read from the extracted banner when accessed"""
+        return self._read_extracted('banner.cbmd')
+    
+    @property
+    def bcwav_data(self):
+        """Banner audio, read from the extracted banner when accessed"""
+        return self._read_extracted('banner.bcwav')
     
     def get_regions(self):
         """Get list of available regions"""
@@ -307,8 +377,10 @@ class BannerEditor:
         output_path = output_path or self.banner_path
         
         # Save all bcmdl files
-        for num, bcmdl in self.bcmdl_files.items():
-            bcmdl.save(os.path.join(self.temp_dir, f'banner{num}.bcmdl'))
+        targets = [(os.path.join(self.temp_dir, f'banner{num}.bcmdl'), bcmdl)
+                   for num, bcmdl in self.bcmdl_files.items()]
+        for path, bcmdl in targets:
+            bcmdl._write_to(path)
         
         # Build banner
         if not build_banner(self.temp_dir, output_path):
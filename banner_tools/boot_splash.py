@@ -17,11 +17,20 @@ This tool can:
 3. Convert between formats
 """
 
+import functools
 import os
 import sys
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# LZ11 match extension, shared with the banner editor
+try:
+    from .gba_vc_banner import _lz11_match_length
+except ImportError:
+    # Running as standalone script
+    from gba_vc_banner import _lz11_match_length
+
 
 # BCLIM texture formats
 BCLIM_FORMATS = {
@@ -53,22 +62,38 @@ TILE_ORDER = [
     52, 53, 60, 61, 54, 55, 62, 63
 ]
 
+# (morton_idx, local_x, local_y) for each slot of TILE_ORDER
+_TILE_SLOTS = tuple((i, p % 8, p // 8) for i, p in enumerate(TILE_ORDER))
+
+# Inverse permutation for de-tiling: _INV_TILE_ORDER[y * 8 + x] = morton_idx
+_INV_TILE_ORDER = [0] * 64
+for _morton_idx, _pixel_idx in enumerate(TILE_ORDER):
+    _INV_TILE_ORDER[_pixel_idx] = _morton_idx
+del _morton_idx, _pixel_idx
+
+# Precompiled binary layouts
+_U32 = struct.Struct('<I')
+_FLIM_FOOTER = struct.Struct('<4sHHIII4sIHHII')   # FLIM header + imag section
+_DARC_HEADER = struct.Struct('<4sHHIIIII')
+_DARC_FIELDS = struct.Struct('<8xII8xII')         # 0x08, 0x0C, 0x18, 0x1C
+
 
 def lz11_decompress(data):
     """Decompress LZ11 data"""
     if len(data) < 4 or data[0] != 0x11:
         return data
     
-    decompressed_size = struct.unpack_from('<I', data, 0)[0] >> 8
-    result = bytearray()
+    decompressed_size = _U32.unpack_from(data, 0)[0] >> 8
+    result = bytearray(decompressed_size)
+    out = 0
     pos = 4
     
-    while len(result) < decompressed_size and pos < len(data):
+    while out < decompressed_size and pos < len(data):
         flags = data[pos]
         pos += 1
         
         for i in range(8):
-            if pos >= len(data) or len(result) >= decompressed_size:
+            if pos >= len(data) or out >= decompressed_size:
                 break
             
             if flags & (0x80 >> i):
@@ -100,73 +125,136 @@ def lz11_decompress(data):
                     length = indicator + 1
                     disp = ((byte1 & 0x0F) << 8 | byte2) + 1
                 
-                for _ in range(length):
-                    if len(result) < disp:
-                        result.append(0)
-                    else:
-                        result.append(result[-disp])
+                # References before the start of the output read as zeros.
+                # Copies may run past decompressed_size; slice assignment
+                # grows the buffer like the old extend() did.
+                if out < disp:
+                    pad = min(length, disp - out)
+                    result[out:out + pad] = bytes(pad)
+                    out += pad
+                    length -= pad
+                
+                # Overlapping copy: result[start:out] always spans whole
+                # periods, so it can be repeated as one slice, doubling
+                start = out - disp
+                while length > out - start:
+                    chunk = out - start
+                    result[out:out + chunk] = result[start:out]
+                    out += chunk
+                    length -= chunk
+                
+                result[out:out + length] = result[start:start + length]
+                out += length
             else:
-                result.append(data[pos])
+                result[out] = data[pos]
+                out += 1
                 pos += 1
     
+    del result[out:]
     return bytes(result)
 
 
+# LZ11 match finder limits
+LZ11_WINDOW = 0x1000        # Maximum back-reference distance
+LZ11_MAX_MATCH = 0x10110    # Longest encodable match
+LZ11_MAX_CHAIN = 128        # Hash chain entries examined per position
+
+
 def lz11_compress(data):
-    """Simple LZ11 compression"""
-    result = bytearray()
+    """
+    LZ11 compression.
+    
+    Matches are found through zlib-style hash chains: head[h] holds the
+    latest position whose next 3 bytes hash to h, prev[] links each
+    position to the previous one with the same hash.
+    """
+    data = bytes(data)
     size = len(data)
-    result.extend([0x11, size & 0xFF, (size >> 8) & 0xFF, (size >> 16) & 0xFF])
+    # Worst case is all literals: one flag byte per 8 input bytes
+    result = bytearray(4 + size + (size + 7) // 8)
+    result[0:4] = bytes((0x11, size & 0xFF, (size >> 8) & 0xFF, (size >> 16) & 0xFF))
+    out = 4
+    
+    head = [-1] * 0x10000
+    prev = [-1] * 0x8000
+    
+    # 16-bit hash of the 3 bytes at every position, computed up front in
+    # one pass (valid for pos < size - 2)
+    hashes = [((x << 8) ^ (y << 4) ^ z) & 0xFFFF
+              for x, y, z in zip(data, data[1:], data[2:])]
     
     pos = 0
-    while pos < len(data):
-        flag_pos = len(result)
-        result.append(0)
+    while pos < size:
+        flag_pos = out
+        out += 1
         flags = 0
         
         for i in range(8):
-            if pos >= len(data):
+            if pos >= size:
                 break
             
+            # Fewer than 3 bytes left can't form a match: emit literals
+            if pos + 2 >= size:
+                result[out] = data[pos]
+                out += 1
+                pos += 1
+                continue
+            
             best_len = 0
             best_disp = 0
+            max_len = min(LZ11_MAX_MATCH, size - pos)
+            cand = head[hashes[pos]]
+            chain = LZ11_MAX_CHAIN
             
-            search_start = max(0, pos - 4096)
-            for sp in range(search_start, pos):
-                ml = 0
-                while (pos + ml < len(data) and ml < 0x10110 and
-                       data[sp + (ml % (pos - sp))] == data[pos + ml]):
-                    ml += 1
-                if ml > best_len:
-                    best_len = ml
-                    best_disp = pos - sp
+            while cand >= 0 and pos - cand <= LZ11_WINDOW and chain:
+                # Only a candidate that also matches at best_len can win
+                if data[cand + best_len] == data[pos + best_len]:
+                    ml = _lz11_match_length(data, cand, pos, max_len)
+                    if ml > best_len:
+                        best_len = ml
+                        best_disp = pos - cand
+                        if ml == max_len:
+                            break
+                cand = prev[cand & 0x7FFF]
+                chain -= 1
             
             if best_len >= 3:
                 flags |= (0x80 >> i)
                 disp = best_disp - 1
                 
                 if best_len <= 0x10:
-                    result.append(((best_len - 1) << 4) | ((disp >> 8) & 0x0F))
-                    result.append(disp & 0xFF)
+                    result[out] = ((best_len - 1) << 4) | ((disp >> 8) & 0x0F)
+                    result[out + 1] = disp & 0xFF
+                    out += 2
                 elif best_len <= 0x110:
                     length = best_len - 0x11
-                    result.append((length >> 4) & 0x0F)
-                    result.append(((length & 0x0F) << 4) | ((disp >> 8) & 0x0F))
-                    result.append(disp & 0xFF)
+                    result[out] = (length >> 4) & 0x0F
+                    result[out + 1] = ((length & 0x0F) << 4) | ((disp >> 8) & 0x0F)
+                    result[out + 2] = disp & 0xFF
+                    out += 3
                 else:
                     length = best_len - 0x111
-                    result.append(0x10 | ((length >> 12) & 0x0F))
-                    result.append((length >> 4) & 0xFF)
-                    result.append(((length & 0x0F) << 4) | ((disp >> 8) & 0x0F))
-                    result.append(disp & 0xFF)
-                
-                pos += best_len
+                    result[out] = 0x10 | ((length >> 12) & 0x0F)
+                    result[out + 1] = (length >> 4) & 0xFF
+                    result[out + 2] = ((length & 0x0F) << 4) | ((disp >> 8) & 0x0F)
+                    result[out + 3] = disp & 0xFF
+                    out += 4
+                step = best_len
             else:
-                result.append(data[pos])
-                pos += 1
+                result[out] = data[pos]
+                out += 1
+                step = 1
+            
+            # Add every consumed position to the hash chains
+            for p in range(pos, min(pos + step, size - 2)):
+                h = hashes[p]
+                prev[p & 0x7FFF] = head[h]
+                head[h] = p
+            pos += step
         
         result[flag_pos] = flags
     
+    del result[out:]
     return bytes(result)
 
 
@@ -183,123 +271,207 @@ def rgba_to_rgb565(r, g, b, a=255):
     return ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
 
 
-def create_bclim(image_data, width, height, format_type=5):
+def rgba_to_rgb565_bytes(r, g, b):
     """
-    Create a BCLIM image file.
+    Convert whole R, G, B planes (one byte per pixel) to RGB565.
     
-    format_type: 5 = RGB565 (recommended for boot splash)
+    Bulk counterpart of rgba_to_rgb565: returns little-endian 16-bit
+    texels as a bytearray, using table lookups and big-integer ORs instead of
+    a Python call per pixel.
     """
+    # texture_encoder needs Pillow, so it's only imported once texels are
+    # being encoded (as with the Pillow imports in this module)
+    try:
+        from .texture_encoder import (
+            _RGB565_R_HI, _RGB565_G_HI, _RGB565_G_LO, _RGB565_B_LO, _or_bytes)
+    except ImportError:
+        # Running as standalone script
+        from texture_encoder import (
+            _RGB565_R_HI, _RGB565_G_HI, _RGB565_G_LO, _RGB565_B_LO, _or_bytes)
+    
+    texels = bytearray(len(r) * 2)
+    texels[0::2] = _or_bytes(g.translate(_RGB565_G_LO), b.translate(_RGB565_B_LO))
+    texels[1::2] = _or_bytes(r.translate(_RGB565_R_HI), g.translate(_RGB565_G_HI))
+    return texels
+
+
+def _tile_texels(linear, width, height, bytes_per_pixel):
+    """
+    Reorder row-major texels into 8x8 Morton tiles.
+    
+    width and height must be multiples of 8. Each strided slice moves one
+    Morton slot of every tile in a tile row at once.
+    """
+    fmt = 'H' if bytes_per_pixel == 2 else 'I'
+    out = bytearray(len(linear))
+    tile_row = width * 8
+    
+    # Typed views over the buffers; released on exit so callers can resize out
+    with memoryview(linear).cast(fmt) as src, memoryview(out).cast(fmt) as dst:
+        for base in range(0, width * height, tile_row):
+            for morton_idx, local_x, local_y in _TILE_SLOTS:
+                s = base + local_y * width + local_x
+                dst[base + morton_idx:base + tile_row:64] = src[s:s + width:8]
+    
+    return out
+
+
+def _rgba_planes(image_data, width, height):
+    """
+    Split an image into bottom-up R, G, B, A planes (one byte per pixel).
+    
+    Raw RGBA bytes may be short; missing pixels are treated as opaque black.
+    """
+    if hasattr(image_data, 'getbands'):  # PIL image
+        from PIL import Image
+        if image_data.size != (width, height):
+            raise ValueError(f"Image is {image_data.size}, expected {(width, height)}")
+        flipped = image_data.convert('RGBA').transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+        return tuple(band.tobytes() for band in flipped.split())
+    
+    row_size = width * 4
+    pixels = bytes(image_data[:row_size * height])
+    pixels = pixels[:len(pixels) // 4 * 4]
+    pixels += b'\x00\x00\x00\xff' * (width * height - len(pixels) // 4)
+    
+    # Flip Y axis
+    pixels = b''.join(pixels[y * row_size:(y + 1) * row_size] for y in range(height - 1, -1, -1))
+    return pixels[0::4], pixels[1::4], pixels[2::4], pixels[3::4]
+
+
+def _bclim_format(format_type):
+    """Return (bytes_per_pixel, black texel) for a supported BCLIM format."""
+    if format_type == 5:  # RGB565
+        return 2, b'\x00\x00'
+    elif format_type == 9:  # RGBA8
+        return 4, b'\xff\x00\x00\x00'  # A, B, G, R
+    raise ValueError(f"Unsupported format: {format_type}")
+
+
+def _build_bclim(texels, width, height, format_type):
+    """Pad row-major texels to whole tiles, tile them and append the header."""
+    bytes_per_pixel, black = _bclim_format(format_type)
+    
     # Calculate padded dimensions (must be multiples of 8)
     padded_width = ((width + 7) // 8) * 8
     padded_height = ((height + 7) // 8) * 8
     
-    # Convert image data to tiles
+    # Pad to whole tiles with black, copying rows into a pre-filled buffer
+    if padded_width != width:
+        row_size = width * bytes_per_pixel
+        padded_row_size = padded_width * bytes_per_pixel
+        padded = bytearray(black * (padded_width * height))
+        for y in range(height):
+            padded[y * padded_row_size:y * padded_row_size + row_size] = \
+                texels[y * row_size:(y + 1) * row_size]
+        texels = padded
+    texels += black * (padded_width * (padded_height - height))
+    
+    # Create tiled texture data
+    texture_data = _tile_texels(texels, padded_width, padded_height, bytes_per_pixel)
+    
+    # Build BCLIM file: texture data first, then the header at the end
+    # (FLIM magic is reversed BCLIM; file size keeps the original
+    # offset-of-field + 0x28 value)
+    header = _FLIM_FOOTER.pack(b'FLIM', 0xFEFF, 0x14, 0x02,
+                               len(texture_data) + 0x0C + 0x28, 1,
+                               b'imag', 0x10, width, height, format_type, len(texture_data))
+    
+    texture_data += header
+    return bytes(texture_data)
+
+
+def create_bclim(image_data, width, height, format_type=5):
+    """
+    Create a BCLIM image file.
+    
+    image_data: raw RGBA bytes, or a PIL image of exactly width x height
+    (its bands are read directly, skipping the RGBA byte round-trip)
+    format_type: 5 = RGB565 (recommended for boot splash)
+    """
+    bytes_per_pixel, _ = _bclim_format(format_type)
+    
+    # Y-flipped channel planes, converted all at once below
+    r, g, b, a = _rgba_planes(image_data, width, height)
     if format_type == 5:  # RGB565
-        bytes_per_pixel = 2
+        texels = rgba_to_rgb565_bytes(r, g, b)
     elif format_type == 9:  # RGBA8
-        bytes_per_pixel = 4
-    else:
-        raise ValueError(f"Unsupported format: {format_type}")
+        texels = bytearray(width * height * bytes_per_pixel)
+        texels[0::4], texels[1::4], texels[2::4], texels[3::4] = a, b, g, r
     
-    # Create tiled texture data
-    texture_data = bytearray()
-    
-    for tile_y in range(padded_height // 8):
-        for tile_x in range(padded_width // 8):
-            for morton_idx in range(64):
-                pixel_idx = TILE_ORDER[morton_idx]
-                local_x = pixel_idx % 8
-                local_y = pixel_idx // 8
-                
-                x = tile_x * 8 + local_x
-                y = tile_y * 8 + local_y
-                
-                # Flip Y axis
-                src_y = height - 1 - y
-                
-                if x < width and src_y >= 0 and src_y < height:
-                    src_idx = (src_y * width + x) * 4
-                    if src_idx + 3 < len(image_data):
-                        r = image_data[src_idx]
-                        g = image_data[src_idx + 1]
-                        b = image_data[src_idx + 2]
-                        a = image_data[src_idx + 3]
-                    else:
-                        r, g, b, a = 0, 0, 0, 255
-                else:
-                    r, g, b, a = 0, 0, 0, 255
-                
-                if format_type == 5:  # RGB565
-                    value = rgba_to_rgb565(r, g, b)
-                    texture_data.extend(struct.pack('<H', value))
-                elif format_type == 9:  # RGBA8
-                    texture_data.extend([a, b, g, r])
-    
-    # Build BCLIM file
-    result = bytearray()
-    
-    # Texture data first
-    result.extend(texture_data)
-    
-    # BCLIM header (at end of file)
-    # FLIM magic (reversed BCLIM)
-    result.extend(b'FLIM')
-    result.extend(struct.pack('<H', 0xFEFF))  # BOM
-    result.extend(struct.pack('<H', 0x14))    # Header size
-    result.extend(struct.pack('<I', 0x02))    # Version
-    result.extend(struct.pack('<I', len(result) + 0x28))  # File size
-    result.extend(struct.pack('<I', 1))       # Number of sections
-    
-    # imag section
-    result.extend(b'imag')
-    result.extend(struct.pack('<I', 0x10))    # Section size
-    result.extend(struct.pack('<H', width))
-    result.extend(struct.pack('<H', height))
-    result.extend(struct.pack('<I', format_type))  # Format
-    result.extend(struct.pack('<I', len(texture_data)))
+    return _build_bclim(texels, width, height, format_type)
+
+
+@functools.lru_cache(maxsize=8)
+def create_solid_bclim(width, height, rgba=(0, 0, 0, 255), format_type=5):
+    """
+    Create a BCLIM filled with a single color.
     
-    return bytes(result)
+    Skips image conversion entirely: every texel is the same, so the
+    texture is just one encoded texel repeated. Results are cached.
+    """
+    _bclim_format(format_type)
+    r, g, b, a = rgba
+    if format_type == 5:  # RGB565
+        texel = rgba_to_rgb565(r, g, b).to_bytes(2, 'little')
+    else:  # RGBA8
+        texel = bytes((a, b, g, r))
+    
+    return _build_bclim(bytearray(texel * (width * height)), width, height, format_type)
 
 
 def parse_darc(data):
-    """Parse DARC archive and extract files"""
+    """
+    Parse DARC archive and extract files.
+    
+    File contents are returned as memoryview slices of data, not copies.
+    """
     if data[:4] != b'darc':
         raise ValueError("Not a DARC file")
     
-    header_size = struct.unpack_from('<I', data, 0x08)[0]
-    file_data_offset = struct.unpack_from('<I', data, 0x0C)[0]
-    
-    # File entry table
-    root_offset = struct.unpack_from('<I', data, 0x18)[0]
-    root_count = struct.unpack_from('<I', data, 0x1C)[0]
+    # Header fields and file entry table location
+    header_size, file_data_offset, root_offset, root_count = _DARC_FIELDS.unpack_from(data, 0)
     
     files = {}
+    view = memoryview(data)
     
     # Simplified extraction - read entries
     entry_offset = 0x1C
     name_table_offset = entry_offset + root_count * 12
+    name_table = data[name_table_offset:file_data_offset]
+    
+    # Unpack the whole entry table at once: (name, offset, size) triples
+    fields = struct.unpack_from(f'<{root_count * 3}I', data, entry_offset)
     
-    for i in range(1, root_count):  # Skip root entry
-        entry_pos = entry_offset + i * 12
-        name_offset = struct.unpack_from('<I', data, entry_pos)[0] & 0x00FFFFFF
-        data_offset = struct.unpack_from('<I', data, entry_pos + 4)[0]
-        data_size = struct.unpack_from('<I', data, entry_pos + 8)[0]
+    # Skip root entry
+    for name_offset, data_offset, data_size in zip(fields[3::3], fields[4::3], fields[5::3]):
+        name_offset &= 0x00FFFFFF
         
         # Read name
-        name_pos = name_table_offset + name_offset
-        name_end = data.find(b'\x00', name_pos)
+        name_end = name_table.find(b'\x00', name_offset)
         if name_end == -1:
-            name_end = name_pos + 256
-        name = data[name_pos:name_end].decode('utf-8', errors='ignore')
+            name_end = name_offset + 256
+        name = name_table[name_offset:name_end].decode('utf-8', errors='ignore')
         
         if data_size > 0 and data_offset > 0:
-            files[name] = data[data_offset:data_offset + data_size]
+            files[name] = view[data_offset:data_offset + data_size]
     
     return files
 
 
-def create_darc(files):
-    """Create DARC archive from dictionary of files"""
+def create_darc(files, sort_key=None):
+    """
+    Create DARC archive from dictionary of files.
+    
+    Files are stored in insertion order unless sort_key is given, in which
+    case they are ordered by sort_key(name). Placing similar files next to
+    each other gives LZ11 more matches inside its 4 KB window. Boot
+    splashes keep insertion order (top.bclim, then bottom.bclim).
+    """
+    items = files.items()
+    if sort_key is not None:
+        items = sorted(items, key=lambda item: sort_key(item[0]))
+    
     # Build file entries and name table
     entries = []
     name_table = bytearray()
@@ -312,7 +484,7 @@ def create_darc(files):
     name_table.extend(b'\x00\x00')
     
     data_offset = 0
-    for name, data in files.items():
+    for name, data in items:
         name_offset = len(name_table)
         name_table.extend(name.encode('utf-8'))
         name_table.extend(b'\x00\x00')  # Null terminator + padding
@@ -333,39 +505,19 @@ def create_darc(files):
     
     file_data_start = header_size + entries_size + name_table_size
     
-    # Build DARC
-    result = bytearray()
-    
-    # Header
-    result.extend(b'darc')
-    result.extend(struct.pack('<H', 0xFEFF))  # BOM
-    result.extend(struct.pack('<H', header_size))
-    result.extend(struct.pack('<I', 0x01000000))  # Version
-    file_size_pos = len(result)
-    result.extend(struct.pack('<I', 0))  # File size (placeholder)
-    result.extend(struct.pack('<I', file_data_start))  # File data offset
-    result.extend(struct.pack('<I', len(file_data)))   # File data size
-    result.extend(struct.pack('<I', entries_size))     # Entries size
-    
-    # Entries
+    # Entries (root entry flagged as a directory)
+    fields = []
     for name_off, data_off, size in entries:
         if data_off == 0 and size > 1:  # Root
-            result.extend(struct.pack('<I', 0x01000000 | name_off))
-        else:
-            result.extend(struct.pack('<I', name_off))
-        result.extend(struct.pack('<I', file_data_start + data_off if size > 0 else 0))
-        result.extend(struct.pack('<I', size))
-    
-    # Name table
-    result.extend(name_table)
+            name_off |= 0x01000000
+        fields += (name_off, file_data_start + data_off if size > 0 else 0, size)
     
-    # File data
-    result.extend(file_data)
+    # Build DARC: header, entries, name table, file data
+    file_size = file_data_start + len(file_data)
+    header = _DARC_HEADER.pack(b'darc', 0xFEFF, header_size, 0x01000000,
+                               file_size, file_data_start, len(file_data), entries_size)
     
-    # Update file size
-    struct.pack_into('<I', result, file_size_pos, len(result))
-    
-    return bytes(result)
+    return b''.join((header, struct.pack(f'<{len(fields)}I', *fields), name_table, file_data))
 
 
 def create_boot_splash(top_image_path, bottom_image_path=None, output_path='logo.bcma.lz'):
@@ -380,25 +532,27 @@ def create_boot_splash(top_image_path, bottom_image_path=None, output_path='logo
     except ImportError:
         raise RuntimeError("PIL/Pillow required: pip install Pillow")
     
-    # Load and prepare top screen image
-    top_img = Image.open(top_image_path).convert('RGBA')
-    if top_img.size != (400, 240):
-        print(f"Resizing top image from {top_img.size} to 400x240")
-        top_img = top_img.resize((400, 240), Image.Resampling.LANCZOS)
-    
-    top_bclim = create_bclim(top_img.tobytes(), 400, 240, format_type=5)
-    
-    # Load or create bottom screen image
-    if bottom_image_path and os.path.exists(bottom_image_path):
-        bottom_img = Image.open(bottom_image_path).convert('RGBA')
-        if bottom_img.size != (320, 240):
-            print(f"Resizing bottom image from {bottom_img.size} to 320x240")
-            bottom_img = bottom_img.resize((320, 240), Image.Resampling.LANCZOS)
-    else:
-        # Create black bottom screen
-        bottom_img = Image.new('RGBA', (320, 240), (0, 0, 0, 255))
-    
-    bottom_bclim = create_bclim(bottom_img.tobytes(), 320, 240, format_type=5)
+    def screen_bclim(image_path, size, screen):
+        img = Image.open(image_path).convert('RGBA')
+        if img.size != size:
+            print(f"Resizing {screen} image from {img.size} to {size[0]}x{size[1]}")
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        return create_bclim(img, size[0], size[1], format_type=5)
+    
+    # Process both screens concurrently. Only Pillow's decode, convert and
+    # resize steps release the GIL and overlap; the RGB565 translate/OR,
+    # tiling and padding in create_bclim hold it and run one at a time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        top_future = executor.submit(screen_bclim, top_image_path, (400, 240), 'top')
+        
+        if bottom_image_path and os.path.exists(bottom_image_path):
+            bottom_future = executor.submit(screen_bclim, bottom_image_path, (320, 240), 'bottom')
+        else:
+            # Black bottom screen
+            bottom_future = executor.submit(create_solid_bclim, 320, 240, format_type=5)
+        
+        top_bclim = top_future.result()
+        bottom_bclim = bottom_future.result()
     
     # Create DARC archive
     files = {
@@ -424,8 +578,10 @@ def create_boot_splash(top_image_path, bottom_image_path=None, output_path='logo
 
 def extract_boot_splash(splash_path, output_dir):
     """Extract images from a boot splash file"""
+    # Read straight into a buffer sized from the file
     with open(splash_path, 'rb') as f:
-        data = f.read()
+        data = bytearray(os.fstat(f.fileno()).st_size)
+        del data[f.readinto(data):]
     
     # Decompress if LZ11
     if data[0] == 0x11:
@@ -485,17 +641,16 @@ def create_gba_vc_splash(game_name=None, output_path='logo.bcma.lz'):
     except ImportError:
         raise RuntimeError("PIL/Pillow required: pip install Pillow")
     
-    # Create purple gradient top screen
-    top = Image.new('RGBA', (400, 240))
-    draw = ImageDraw.Draw(top)
-    
-    # Purple gradient (similar to GBA VC)
+    # Create purple gradient top screen (similar to GBA VC): build one
+    # pixel column, dark purple to lighter purple, and stretch it across
+    column = bytearray()
     for y in range(240):
-        # Gradient from dark purple to lighter purple
-        r = int(48 + (y / 240) * 32)
-        g = int(0 + (y / 240) * 16)
-        b = int(80 + (y / 240) * 48)
-        draw.line([(0, y), (399, y)], fill=(r, g, b, 255))
+        column += bytes((int(48 + (y / 240) * 32),
+                         int(0 + (y / 240) * 16),
+                         int(80 + (y / 240) * 48),
+                         255))
+    top = Image.frombytes('RGBA', (1, 240), bytes(column)).resize((400, 240), Image.Resampling.NEAREST)
+    draw = ImageDraw.Draw(top)
     
     # Add GBA text (simplified - real font would need TTF)
     try:
@@ -7,7 +7,7 @@ Helps identify the correct offsets for different VC templates.
 """
 
 import sys
-import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -16,132 +16,123 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# Tables, untiling and the parsed-structure cache are shared with cgfx_analyzer
+try:
+    from . import _cgfx_core as core
+except ImportError:
+    # Running as standalone script
+    import _cgfx_core as core
 
-def morton_index(x: int, y: int) -> int:
-    """Morton Z-order index for 8x8 tile."""
-    morton = 0
-    for i in range(3):
-        morton |= ((x >> i) & 1) << (2 * i)
-        morton |= ((y >> i) & 1) << (2 * i + 1)
-    return morton
+morton_index = core.morton_index
 
 
 def decode_rgba8(data: bytes, width: int, height: int) -> 'Image.Image':
     """Decode RGBA8 Morton-tiled texture."""
-    tiles_x = width // 8
-    tiles_y = height // 8
-    expected = tiles_x * tiles_y * 256
-    
-    if len(data) < expected:
-        return None
-    
-    img = Image.new('RGBA', (width, height))
-    pixels = img.load()
-    
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            tile_off = (ty * tiles_x + tx) * 256
-            for py in range(8):
-                for px in range(8):
-                    idx = tile_off + morton_index(px, py) * 4
-                    if idx + 4 <= len(data):
-                        a, b, g, r = data[idx:idx + 4]
-                        pixels[tx * 8 + px, ty * 8 + py] = (r, g, b, a)
-    return img
+    return core.decode_tiled(data, 0, width, height, 'RGBA8')
 
 
 def decode_la8(data: bytes, width: int, height: int) -> 'Image.Image':
     """Decode LA8 Morton-tiled texture."""
-    tiles_x = width // 8
-    tiles_y = height // 8
-    expected = tiles_x * tiles_y * 128
-    
-    if len(data) < expected:
-        return None
-    
-    img = Image.new('RGBA', (width, height))
-    pixels = img.load()
-    
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            tile_off = (ty * tiles_x + tx) * 128
-            for py in range(8):
-                for px in range(8):
-                    idx = tile_off + morton_index(px, py) * 2
-                    if idx + 2 <= len(data):
-                        a, l = data[idx:idx + 2]
-                        pixels[tx * 8 + px, ty * 8 + py] = (l, l, l, a)
-    return img
+    return core.decode_tiled(data, 0, width, height, 'LA8')
+
+
+# Known texture sizes to look for
+_TEXTURE_CONFIGS = (
+    # (width, height, format, name, expected_bytes)
+    (128, 128, 'RGBA8', 'COMMON1_128x128_RGBA8', 65536),
+    (256, 64, 'LA8', 'COMMON2_256x64_LA8', 32768),
+    (128, 128, 'LA8', 'texture_128x128_LA8', 32768),
+    (128, 128, 'ETC1', 'COMMON3_128x128_ETC1', 8192),  # Can't decode easily
+)
+
+
+def _corner_variety(view, offset: int, width: int, height: int, bpp: int) -> int:
+    """
+    Count distinct texels in the top-left (up to) 32x32 pixels of a tiled
+    texture, straight from the raw bytes.
+    
+    Texels map one-to-one to decoded colors, so this equals the number of
+    colors in that corner of the decoded image (for tile-aligned sizes)
+    without decoding anything.
+    """
+    tile_bytes = 64 * bpp
+    row_bytes = (width // 8) * tile_bytes
+    corner_bytes = (min(width, 32) // 8) * tile_bytes
+    fmt = 'I' if bpp == 4 else 'H'
+    texels = set()
+    for ty in range(min(height, 32) // 8):
+        start = offset + ty * row_bytes
+        texels.update(view[start:start + corner_bytes].cast(fmt))
+    return len(texels)
 
 
 def find_textures(cgfx_path: str, output_dir: str = '.'):
     """Find and extract textures from CGFX file."""
-    with open(cgfx_path, 'rb') as f:
-        data = f.read()
-    
-    basename = Path(cgfx_path).stem
-    out_path = Path(output_dir)
-    out_path.mkdir(exist_ok=True)
-    
-    print(f"\n{'='*60}")
-    print(f"Scanning: {Path(cgfx_path).name} ({len(data):,} bytes)")
-    print(f"{'='*60}\n")
-    
-    # Known texture sizes to look for
-    texture_configs = [
-        # (width, height, format, name, expected_bytes)
-        (128, 128, 'RGBA8', 'COMMON1_128x128_RGBA8', 65536),
-        (256, 64, 'LA8', 'COMMON2_256x64_LA8', 32768),
-        (128, 128, 'LA8', 'texture_128x128_LA8', 32768),
-        (128, 128, 'ETC1', 'COMMON3_128x128_ETC1', 8192),  # Can't decode easily
-    ]
-    
-    # Scan for potential texture data starts
-    # Textures are usually 0x100 or 0x1000 aligned
-    candidates = []
-    
-    for align in [0x100]:
-        for offset in range(align, len(data) - 0x8000, align):
-            # Check if this looks like texture data
-            # (non-zero, somewhat random-looking)
-            chunk = data[offset:offset + 64]
-            if len(set(chunk)) > 10:  # Has some variety
-                candidates.append(offset)
-    
-    print(f"Found {len(candidates)} candidate offsets (0x100 aligned with entropy)\n")
-    
-    # Try to extract textures at candidate offsets
-    print("Extracting candidate textures...\n")
-    
-    found_textures = []
-    
-    for offset in candidates:
-        for width, height, fmt, name, expected in texture_configs:
-            if offset + expected > len(data):
-                continue
-            
-            chunk = data[offset:offset + expected]
-            
-            # Try to decode
-            if fmt == 'RGBA8':
-                img = decode_rgba8(chunk, width, height)
-            elif fmt == 'LA8':
-                img = decode_la8(chunk, width, height)
-            else:
-                continue
-            
-            if img:
-                # Check if it looks like a real texture (not all same color)
-                colors = set()
-                for y in range(min(height, 32)):
-                    for x in range(min(width, 32)):
-                        colors.add(img.getpixel((x, y)))
+    with core.map_file(cgfx_path) as data, memoryview(data) as view:
+        basename = Path(cgfx_path).stem
+        out_path = Path(output_dir)
+        out_path.mkdir(exist_ok=True)
+        
+        print(f"\n{'='*60}")
+        print(f"Scanning: {Path(cgfx_path).name} ({len(data):,} bytes)")
+        print(f"{'='*60}\n")
+        
+        # Scan for potential texture data starts
+        # Textures are usually 0x100 or 0x1000 aligned
+        # Check if each offset looks like texture data (non-zero, somewhat
+        # random-looking): more than 10 distinct bytes in the first 64. Most
+        # texture data already has that many in its first 16 bytes, so that
+        # smaller set is tried first.
+        align = 0x100
+        candidates = [
+            offset for offset in range(align, len(data) - 0x8000, align)
+            if len(set(data[offset:offset + 16])) > 10 or len(set(data[offset:offset + 64])) > 10
+        ]
+        
+        print(f"Found {len(candidates)} candidate offsets (0x100 aligned with entropy)\n")
+        
+        # Try to extract textures at candidate offsets
+        print("Extracting candidate textures...\n")
+        
+        found_textures = []
+        
+        # Every candidate x config cell is independent: filter on the raw
+        # texels here, then decode the survivors across a thread pool.
+        # map() yields in submission order so the report stays stable.
+        cells = []
+        for offset in candidates:
+            for width, height, fmt, name, expected in _TEXTURE_CONFIGS:
+                if offset + expected > len(data):
+                    continue
+                if fmt not in core.TEXEL_BYTES:
+                    continue
                 
-                if len(colors) > 3:  # Has some variety
+                # Check it looks like a real texture (not all same color):
+                # more than 3 colors in the top-left 32x32, read from the raw
+                # texels so flat candidates are never decoded
+                if _corner_variety(view, offset, width, height, core.TEXEL_BYTES[fmt]) <= 3:
+                    continue
+                cells.append((offset, width, height, fmt, expected))
+        
+        def decode_cell(cell):
+            offset, width, height, fmt, _ = cell
+            # Decode straight out of the mapping, no copy of the texture
+            return core.decode_tiled(view, offset, width, height, fmt)
+        
+        # PNG encoding releases the GIL, so saves run on their own pool and
+        # overlap the remaining decodes. These are diagnostic dumps, so a
+        # fast, light deflate is worth the slightly larger files.
+        saves = []
+        with ThreadPoolExecutor() as executor, ThreadPoolExecutor() as save_pool:
+            for (offset, width, height, fmt, _), img in zip(cells, executor.map(decode_cell, cells)):
+                if img:
                     out_file = out_path / f"{basename}_0x{offset:05X}_{width}x{height}_{fmt}.png"
-                    img.save(str(out_file))
+                    saves.append(save_pool.submit(img.save, str(out_file), compress_level=1))
                     found_textures.append((offset, width, height, fmt, str(out_file)))
                     print(f"  Found: 0x{offset:05X} - {width}x{height} {fmt}")
+            # Surface any failed save
+            for save in saves:
+                save.result()
     
     print(f"\n{'='*60}")
     print(f"Summary: Found {len(found_textures)} potential textures")
@@ -165,18 +156,16 @@ def find_textures(cgfx_path: str, output_dir: str = '.'):
 def extract_at_offset(cgfx_path: str, offset: int, width: int, height: int, 
                        fmt: str = 'RGBA8', output: str = None):
     """Extract texture at specific offset."""
-    with open(cgfx_path, 'rb') as f:
-        data = f.read()
-    
-    if fmt == 'RGBA8':
-        expected = width * height * 4 // 64 * 256  # Morton tiled
-        img = decode_rgba8(data[offset:offset + expected], width, height)
-    elif fmt == 'LA8':
-        expected = width * height * 2 // 64 * 128  # Morton tiled
-        img = decode_la8(data[offset:offset + expected], width, height)
-    else:
+    if fmt not in core.TEXEL_BYTES:
         print(f"Unknown format: {fmt}")
         return
+    if width % 8 or height % 8:
+        print(f"Morton tiles require 8-pixel multiples, got {width}x{height}")
+        return
+    
+    # Tiling only reorders texels, so only w*h*bpp bytes are read
+    with core.map_file(cgfx_path) as data:
+        img = core.decode_tiled(data, offset, width, height, fmt)
     
     if img:
         if not output:
@@ -193,22 +182,20 @@ def compare_templates(cgfx_paths: list):
     print("Comparing CGFX templates")
     print(f"{'='*60}\n")
     
-    data_list = []
     for path in cgfx_paths:
-        with open(path, 'rb') as f:
-            data_list.append((Path(path).name, f.read()))
-    
-    for name, data in data_list:
-        print(f"{name}: {len(data):,} bytes")
+        print(f"{Path(path).name}: {Path(path).stat().st_size:,} bytes")
     
     # Find COMMON strings in each
     print("\nCOMMON string locations:")
-    for name, data in data_list:
-        print(f"\n  {name}:")
+    for path in cgfx_paths:
+        print(f"\n  {Path(path).name}:")
+        # First offset of each name, from the cached structure sweep
+        first = {}
+        for name, pos in core.load_structure(path).commons:
+            first.setdefault(name.decode(), pos)
         for common in ['COMMON1', 'COMMON2', 'COMMON3']:
-            pos = data.find(common.encode())
-            if pos != -1:
-                print(f"    {common}: 0x{pos:05X}")
+            if common in first:
+                print(f"    {common}: 0x{first[common]:05X}")
 
 
 def main():
@@ -18,6 +18,8 @@ Final Banner Structure:
 - CWAV audio
 """
 
+import concurrent.futures
+import mmap
 import struct
 import os
 import subprocess
@@ -30,6 +32,25 @@ except ImportError:
     ImageDraw = None
     ImageFont = None
 
+# RGB565 encode tables and _or_bytes come from texture_encoder, which needs
+# Pillow; so does every function here that uses them
+if Image is not None:
+    try:
+        from .texture_encoder import (
+            _RGB565_R_HI, _RGB565_G_HI, _RGB565_G_LO, _RGB565_B_LO, _or_bytes)
+    except ImportError:
+        # Running as standalone script
+        from texture_encoder import (
+            _RGB565_R_HI, _RGB565_G_HI, _RGB565_G_LO, _RGB565_B_LO, _or_bytes)
+
+# 3dstool-backed LZ11 compressor and match extension, shared with the
+# banner editor
+try:
+    from .gba_vc_banner import _lz11_compress_external, _lz11_match_length
+except ImportError:
+    # Running as standalone script
+    from gba_vc_banner import _lz11_compress_external, _lz11_match_length
+
 
 # ============================================================================
 # TEXTURE ENCODING/DECODING
@@ -44,6 +65,104 @@ def morton_index(x, y):
     return morton
 
 
+# Morton index of pixel (x, y) of an 8x8 tile, at [y * 8 + x]
+_MORTON_TABLE = tuple(morton_index(i % 8, i // 8) for i in range(64))
+
+# Pixel y * 8 + x of an 8x8 tile for each Morton index (inverse of the above)
+_INV_MORTON_TABLE = tuple(sorted(range(64), key=_MORTON_TABLE.__getitem__))
+
+
+# Memoryview formats by item size in bytes
+_UNIT_FORMATS = {2: 'H', 4: 'I', 8: 'Q'}
+
+# (pair index, row-major pair index) for each Morton slot pair of an 8x8
+# tile: slots 2k and 2k + 1 are pixels x and x + 1 of one row, so they
+# move together
+_MORTON_PAIRS = tuple((m // 2, _INV_MORTON_TABLE[m] // 2) for m in range(0, 64, 2))
+
+
+def _tile_morton(linear, width, height, bpp):
+    """
+    Reorder row-major texels (bpp 2 or 4) into 8x8 Morton tiles.
+    
+    Two passes of strided slice copies: each 8-texel tile row of a tile
+    row of the image is moved into its tile (row-major within the tile),
+    then each Morton pair of slots is filled across every tile at once.
+    Only whole tiles are filled; the rest of the output is zero.
+    """
+    tiles_x, tiles_y = width // 8, height // 8
+    tiles = tiles_x * tiles_y
+    out = bytearray(width * height * bpp)
+    # Pass 1 copies 8-byte units when image rows split evenly into them
+    unit = 8 if width * bpp % 8 == 0 else bpp
+    per_row = 8 * bpp // unit  # units per 8-texel tile row
+    pitch = width * bpp // unit
+    tile_units = 8 * per_row
+    grouped = bytearray(tiles * 64 * bpp)
+    with memoryview(linear).cast(_UNIT_FORMATS[unit]) as src, \
+            memoryview(grouped).cast(_UNIT_FORMATS[unit]) as dst:
+        for ty in range(tiles_y):
+            base = ty * tiles_x * tile_units
+            for y in range(8):
+                s = (ty * 8 + y) * pitch
+                for u in range(per_row):
+                    d = base + y * per_row + u
+                    dst[d:d + tiles_x * tile_units:tile_units] = \
+                        src[s + u:s + tiles_x * per_row:per_row]
+    pair = _UNIT_FORMATS[2 * bpp]
+    with memoryview(grouped).cast(pair) as src, \
+            memoryview(out)[:tiles * 64 * bpp].cast(pair) as dst:
+        for m, i in _MORTON_PAIRS:
+            dst[m::32] = src[i::32]
+    return out
+
+
+def _untile_morton(data, offset, width, height, bpp):
+    """
+    Reorder 8x8 Morton-tiled texels at offset into row-major order.
+    
+    The inverse of _tile_morton's two passes. Texels past the end of data
+    read as zero, as do pixels outside whole tiles.
+    """
+    tiles_x, tiles_y = width // 8, height // 8
+    count = tiles_x * tiles_y * 64
+    avail = max(0, min(count, (len(data) - offset) // bpp))
+    tiled = bytearray(count * bpp)
+    tiled[:avail * bpp] = data[offset:offset + avail * bpp]
+    out = bytearray(width * height * bpp)
+    grouped = bytearray(count * bpp)
+    pair = _UNIT_FORMATS[2 * bpp]
+    with memoryview(tiled).cast(pair) as src, memoryview(grouped).cast(pair) as dst:
+        for m, i in _MORTON_PAIRS:
+            dst[i::32] = src[m::32]
+    unit = 8 if width * bpp % 8 == 0 else bpp
+    per_row = 8 * bpp // unit  # units per 8-texel tile row
+    pitch = width * bpp // unit
+    tile_units = 8 * per_row
+    with memoryview(grouped).cast(_UNIT_FORMATS[unit]) as src, \
+            memoryview(out).cast(_UNIT_FORMATS[unit]) as dst:
+        for ty in range(tiles_y):
+            base = ty * tiles_x * tile_units
+            for y in range(8):
+                d = (ty * 8 + y) * pitch
+                for u in range(per_row):
+                    s = base + y * per_row + u
+                    dst[d + u:d + tiles_x * per_row:per_row] = \
+                        src[s:s + tiles_x * tile_units:tile_units]
+    return out
+
+
+# Per-byte tables from RGB565 bytes back to 8-bit channels
+# (little-endian: low byte = GGGBBBBB, high byte = RRRRRGGG)
+_R_FROM_HI = bytes(v & 0xF8 for v in range(256))
+_G_FROM_HI = bytes((v & 0x07) << 5 for v in range(256))
+_G_FROM_LO = bytes((v >> 5) << 2 for v in range(256))
+_B_FROM_LO = bytes((v & 0x1F) << 3 for v in range(256))
+
+# RGB -> L conversion matrix giving (r + g + b) // 3
+_LUMA_MATRIX = (1 / 3, 1 / 3, 1 / 3, -1 / 3)
+
+
 def resize_cover(img, width, height):
     """
     Resize image using 'cover' mode: scale to cover target area, crop center.
@@ -166,49 +285,23 @@ def encode_rgb565_tiled(img, width=128, height=128, bg_color=None, fit_mode="fit
     elif img.mode != 'RGB':
         img = img.convert('RGB')
     
-    data = bytearray(width * height * 2)
-    tiles_x, tiles_y = width // 8, height // 8
+    # Convert whole R, G, B planes to RGB565 with table lookups
+    r, g, b = (band.tobytes() for band in img.split()[:3])
+    texels = bytearray(width * height * 2)
+    texels[0::2] = _or_bytes(g.translate(_RGB565_G_LO), b.translate(_RGB565_B_LO))
+    texels[1::2] = _or_bytes(r.translate(_RGB565_R_HI), g.translate(_RGB565_G_HI))
     
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            tile_off = (ty * tiles_x + tx) * 128  # 8x8 * 2 bytes
-            for py in range(8):
-                for px in range(8):
-                    idx = tile_off + morton_index(px, py) * 2
-                    x = tx * 8 + px
-                    y = ty * 8 + py
-                    r, g, b = img.getpixel((x, y))[:3]
-                    
-                    # Convert to RGB565
-                    r5 = (r >> 3) & 0x1F
-                    g6 = (g >> 2) & 0x3F
-                    b5 = (b >> 3) & 0x1F
-                    rgb565 = (r5 << 11) | (g6 << 5) | b5
-                    
-                    struct.pack_into('<H', data, idx, rgb565)
-    
-    return bytes(data)
+    return bytes(_tile_morton(texels, width, height, 2))
 
 
 def decode_rgb565_tiled(data, offset, width, height):
     """Decode RGB565 8x8 Morton-tiled texture"""
-    img = Image.new('RGB', (width, height))
-    pixels = img.load()
-    tiles_x, tiles_y = width // 8, height // 8
-    
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            tile_off = offset + (ty * tiles_x + tx) * 128  # 8x8 * 2 bytes
-            for py in range(8):
-                for px in range(8):
-                    idx = tile_off + morton_index(px, py) * 2
-                    if idx + 2 <= len(data):
-                        pixel = struct.unpack_from('<H', data, idx)[0]
-                        r = ((pixel >> 11) & 0x1F) << 3
-                        g = ((pixel >> 5) & 0x3F) << 2
-                        b = (pixel & 0x1F) << 3
-                        pixels[tx * 8 + px, ty * 8 + py] = (r, g, b)
-    return img
+    texels = _untile_morton(data, offset, width, height, 2)
+    lo, hi = bytes(texels[0::2]), bytes(texels[1::2])
+    planes = (hi.translate(_R_FROM_HI),
+              _or_bytes(hi.translate(_G_FROM_HI), lo.translate(_G_FROM_LO)),
+              lo.translate(_B_FROM_LO))
+    return Image.merge('RGB', [Image.frombytes('L', (width, height), p) for p in planes])
 
 
 def encode_la8_morton(img, width=256, height=64):
@@ -223,57 +316,99 @@ def encode_la8_morton(img, width=256, height=64):
     if img.mode != 'RGBA':
         img = img.convert('RGBA')
     
-    data = bytearray(width * height * 2)
-    tiles_x, tiles_y = width // 8, height // 8
-    
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            tile_off = (ty * tiles_x + tx) * 128
-            for py in range(8):
-                for px in range(8):
-                    idx = tile_off + morton_index(px, py) * 2
-                    r, g, b, a = img.getpixel((tx * 8 + px, ty * 8 + py))
-                    l = (r + g + b) // 3  # Luminance
-                    data[idx] = a
-                    data[idx + 1] = l
+    # Luminance is (r + g + b) // 3: the -1/3 offset makes the matrix
+    # conversion's round-to-nearest come out as floor
+    l = img.convert('RGB').convert('L', _LUMA_MATRIX)
+    # Interleave A, L texels in one pass by packing them as an LA image
+    texels = Image.merge('LA', (img.getchannel('A'), l)).tobytes()
     
-    return bytes(data)
+    return bytes(_tile_morton(texels, width, height, 2))
 
 
 def decode_la8_morton(data, offset, width, height):
     """Decode LA8 Morton-tiled texture"""
-    img = Image.new('RGBA', (width, height))
-    pixels = img.load()
-    tiles_x, tiles_y = width // 8, height // 8
-    
-    for ty in range(tiles_y):
-        for tx in range(tiles_x):
-            tile_off = offset + (ty * tiles_x + tx) * 128
-            for py in range(8):
-                for px in range(8):
-                    idx = tile_off + morton_index(px, py) * 2
-                    if idx + 2 <= len(data):
-                        a, l = data[idx:idx + 2]
-                        pixels[tx * 8 + px, ty * 8 + py] = (l, l, l, a)
-    return img
+    texels = _untile_morton(data, offset, width, height, 2)
+    a = Image.frombytes('L', (width, height), bytes(texels[0::2]))
+    l = Image.frombytes('L', (width, height), bytes(texels[1::2]))
+    return Image.merge('RGBA', (l, l, l, a))
 
 
 # ============================================================================
 # LZ11 COMPRESSION
 # ============================================================================
 
+# LZ11 match finder limits
+LZ11_WINDOW = 0x1000      # Maximum back-reference distance
+LZ11_MAX_MATCH = 0x10110  # Longest encodable match
+LZ11_MAX_CHAIN = 32       # Hash chain candidates tried per position
+LZ11_LONG_RUN = 0x20      # A byte run this long is taken without a search
+
+
+def _lz11_hash(data, pos):
+    """16-bit hash of the 3 bytes at pos."""
+    return ((data[pos] << 16 | data[pos + 1] << 8 | data[pos + 2]) * 2654435761 >> 16) & 0xFFFF
+
+
 def compress_lz11(data):
+    """
+    Compress data to LZ11, with 3dstool when it is installed and the Python
+    encoder otherwise.
+    """
+    compressed = _lz11_compress_external(data)
+    if compressed is None:
+        compressed = _compress_lz11_python(data)
+    return compressed
+
+
+def pad_to_align4(data):
+    """Pad data to 4-byte alignment"""
+    padding_needed = (4 - (len(data) % 4)) % 4
+    return bytes(data) + b'\x00' * padding_needed
+
+
+def _compress_cgfx_task(data):
+    """Compress one CGFX section and pad it to 4-byte alignment."""
+    return pad_to_align4(compress_lz11(bytes(data)))
+
+
+def compress_cgfx_sections(sections):
+    """
+    Compress CGFX sections in parallel, one worker process per section.
+
+    Results come back in input order. Falls back to compressing them in
+    turn when a process pool can't be started.
+    """
+    if len(sections) > 1:
+        # Memory-mapped templates can't be pickled for the workers
+        tasks = [s if isinstance(s, (bytes, bytearray)) else bytes(s) for s in sections]
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(len(sections), os.cpu_count() or 1)) as ex:
+                return list(ex.map(_compress_cgfx_task, tasks, chunksize=1))
+        except (OSError, NotImplementedError,
+                concurrent.futures.process.BrokenProcessPool):
+            pass
+    return [_compress_cgfx_task(section) for section in sections]
+
+
+def _compress_lz11_python(data):
     """
     Compress data using a faster, simplified LZ11 encoder.
 
     This prioritizes speed over maximum compression ratio; acceptable for banners.
+    Matches are found through hash chains: head[h] is the latest position
+    whose next 3 bytes hash to h and prev[] links each position to the one
+    before it with the same hash, so only positions sharing a 3-byte prefix
+    are compared, at most LZ11_MAX_CHAIN of them.
     """
+    data = bytes(data)
     result = bytearray()
     size = len(data)
     result.extend([0x11, size & 0xFF, (size >> 8) & 0xFF, (size >> 16) & 0xFF])
 
     pos = 0
-    max_window = 0x1000  # 4096
+    head = [-1] * 0x10000
+    prev = [-1] * LZ11_WINDOW
 
     while pos < size:
         flags_pos = len(result)
@@ -285,27 +420,26 @@ def compress_lz11(data):
 
             best_len = 0
             best_disp = 0
-            window_start = max(0, pos - max_window)
-            window = memoryview(data)[window_start:pos]
-            max_len = min(0x10110, size - pos)
-
-            if len(window) >= 3:
-                seed = bytes(data[pos : pos + 3])
-                search_pos = bytes(window).rfind(seed, 0, len(window))
-                while search_pos != -1:
-                    disp = pos - (window_start + search_pos)
-                    match_len = 3
-                    while match_len < max_len:
-                        next_len = min(match_len + 32, max_len)
-                        if data[pos + match_len : pos + next_len] != data[pos + match_len - disp : pos + next_len - disp]:
-                            break
-                        match_len = next_len
-                    if match_len > best_len:
-                        best_len = match_len
-                        best_disp = disp
-                        if best_len >= max_len:
-                            break
-                    search_pos = bytes(window).rfind(seed, 0, search_pos)
+            max_len = min(LZ11_MAX_MATCH, size - pos)
+
+            if max_len >= 3:
+                # Runs of one byte (padding, cleared texels) match at
+                # distance 1; a long one is taken without walking the chain
+                if pos and data[pos] == data[pos - 1]:
+                    best_len = _lz11_match_length(data, pos - 1, pos, max_len)
+                    best_disp = 1
+
+                cand = head[_lz11_hash(data, pos)]
+                chain = LZ11_MAX_CHAIN if best_len < LZ11_LONG_RUN else 0
+                while cand >= 0 and pos - cand <= LZ11_WINDOW and chain and best_len < max_len:
+                    # Only a candidate that also matches at best_len can win
+                    if data[cand + best_len] == data[pos + best_len]:
+                        match_len = _lz11_match_length(data, cand, pos, max_len)
+                        if match_len > best_len:
+                            best_len = match_len
+                            best_disp = pos - cand
+                    cand = prev[cand & 0xFFF]
+                    chain -= 1
 
             if best_len >= 3:
                 flags |= 0x80 >> bit
@@ -324,10 +458,17 @@ def compress_lz11(data):
                     result.append((adj_len >> 4) & 0xFF)
                     result.append(((adj_len & 0x0F) << 4) | ((disp_m1 >> 8) & 0x0F))
                     result.append(disp_m1 & 0xFF)
-                pos += best_len
+                step = best_len
             else:
                 result.append(data[pos])
-                pos += 1
+                step = 1
+
+            # Index every consumed position that has 3 bytes to hash
+            for p in range(pos, min(pos + step, size - 2)):
+                h = _lz11_hash(data, p)
+                prev[p & 0xFFF] = head[h]
+                head[h] = p
+            pos += step
 
         result[flags_pos] = flags
 
@@ -341,29 +482,39 @@ def decompress_lz11(data, offset=0):
     decompressed_size = struct.unpack_from('<I', data, offset)[0] >> 8
     if decompressed_size > 0x500000:
         return None
-    result = bytearray()
+    # Output goes into a preallocated buffer at a cursor; back-references
+    # are copied as slices instead of byte by byte
+    result = bytearray(decompressed_size)
+    out = 0
     pos = offset + 4
-    while len(result) < decompressed_size and pos < len(data):
+    end = len(data)
+    while out < decompressed_size and pos < end:
         flags = data[pos]
         pos += 1
+        # A zero flag byte means eight literals: copy them as one slice
+        if flags == 0 and pos + 8 <= end and out + 8 <= decompressed_size:
+            result[out:out + 8] = data[pos:pos + 8]
+            out += 8
+            pos += 8
+            continue
         for i in range(8):
-            if len(result) >= decompressed_size:
+            if out >= decompressed_size:
                 break
             if flags & (0x80 >> i):
-                if pos + 2 > len(data):
+                if pos + 2 > end:
                     break
                 byte1 = data[pos]
                 byte2 = data[pos + 1]
                 pos += 2
                 if byte1 >> 4 == 0:
-                    if pos >= len(data):
+                    if pos >= end:
                         break
                     byte3 = data[pos]
                     pos += 1
                     length = ((byte1 & 0x0F) << 4) + (byte2 >> 4) + 0x11
                     disp = ((byte2 & 0x0F) << 8) + byte3 + 1
                 elif byte1 >> 4 == 1:
-                    if pos + 1 >= len(data):
+                    if pos + 1 >= end:
                         break
                     byte3 = data[pos]
                     byte4 = data[pos + 1]
@@ -373,21 +524,45 @@ def decompress_lz11(data, offset=0):
                 else:
                     length = (byte1 >> 4) + 1
                     disp = ((byte1 & 0x0F) << 8) + byte2 + 1
-                for j in range(length):
-                    if len(result) >= decompressed_size:
-                        break
-                    if len(result) < disp:
-                        result.append(0)
-                    else:
-                        result.append(result[-disp])
+                length = min(length, decompressed_size - out)
+                # References before the start of the output read as zeros,
+                # which the buffer already holds
+                if out < disp:
+                    pad = min(length, disp - out)
+                    out += pad
+                    length -= pad
+                # An overlapping copy repeats a disp-byte period, so
+                # result[start:out] is copied whole, doubling each time
+                start = out - disp
+                while length > out - start:
+                    chunk = out - start
+                    result[out:out + chunk] = result[start:out]
+                    out += chunk
+                    length -= chunk
+                result[out:out + length] = result[start:start + length]
+                out += length
             else:
-                if pos >= len(data):
+                if pos >= end:
                     break
-                result.append(data[pos])
+                result[out] = data[pos]
+                out += 1
                 pos += 1
+    del result[out:]
     return bytes(result)
 
 
+def map_template(path):
+    """
+    Map a template file read-only instead of reading it into memory.
+
+    Empty files give b'' (an empty file can't be mapped).
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 # ============================================================================
 # BANNER PATCHER
 # ============================================================================
@@ -426,25 +601,27 @@ class GBAVCBannerPatcher:
         self._load_templates()
     
     def _load_templates(self):
-        """Load template files"""
+        """
+        Load template files.
+
+        Templates are memory-mapped read-only; patch_common1/patch_common2
+        make a writable copy of a CGFX only when they first modify it.
+        """
         # Load common CGFX
         common_path = os.path.join(self.template_dir, 'banner_common.cgfx')
-        with open(common_path, 'rb') as f:
-            self.common_cgfx = bytearray(f.read())
+        self.common_cgfx = map_template(common_path)
         print(f"Loaded common CGFX: {len(self.common_cgfx):,} bytes")
         
         # Load region templates
         self.region_templates = []
         for i, name in enumerate(self.REGIONS):
             region_path = os.path.join(self.template_dir, f'region_{i:02d}_{name}.cgfx')
-            with open(region_path, 'rb') as f:
-                self.region_templates.append(bytearray(f.read()))
+            self.region_templates.append(map_template(region_path))
         print(f"Loaded {len(self.region_templates)} region templates")
         
         # Load audio
         audio_path = os.path.join(self.template_dir, 'banner.bcwav')
-        with open(audio_path, 'rb') as f:
-            self.audio = f.read()
+        self.audio = map_template(audio_path)
         print(f"Loaded audio: {len(self.audio):,} bytes")
     
     def patch_common1(self, image_path, bg_color=None, fit_mode="fit"):
@@ -465,6 +642,8 @@ class GBAVCBannerPatcher:
         if len(encoded) != self.COMMON1_SIZE:
             raise ValueError(f"Encoded size {len(encoded)} != expected {self.COMMON1_SIZE}")
 
+        if not isinstance(self.common_cgfx, bytearray):
+            self.common_cgfx = bytearray(self.common_cgfx)
         self.common_cgfx[self.COMMON1_OFFSET:self.COMMON1_OFFSET + self.COMMON1_SIZE] = encoded
         if bg_color:
             print(f"Patched COMMON1 with {image_path} (bg: RGB{bg_color})")
@@ -488,6 +667,8 @@ class GBAVCBannerPatcher:
             raise ValueError(f"Encoded size {len(encoded)} != expected {self.COMMON2_SIZE}")
         
         for i, region in enumerate(self.region_templates):
+            if not isinstance(region, bytearray):
+                region = self.region_templates[i] = bytearray(region)
             region[self.COMMON2_OFFSET:self.COMMON2_OFFSET + self.COMMON2_SIZE] = encoded
         
         print(f"Patched COMMON2 in all {len(self.REGIONS)} regions with {image_path}")
@@ -539,8 +720,8 @@ class GBAVCBannerPatcher:
                 left_x = 97
                 right_x = 248
             
-            for x in range(left_x, right_x):
-                footer.putpixel((x, y), (gray_val, gray_val, gray_val, 255))
+            # Fill the whole row span with one paste
+            footer.paste((gray_val, gray_val, gray_val, 255), (left_x, y, right_x, y + 1))
         
         # Right box center for centering text
         box_center = 172
@@ -736,21 +917,13 @@ class GBAVCBannerPatcher:
 
     def _decode_la8_to_raw(self, data, offset, width, height):
         """Decode LA8 Morton-tiled texture to raw RGBA bytes (no Pillow)."""
+        texels = _untile_morton(data, offset, width, height, 2)
         out = bytearray(width * height * 4)
-        tiles_x, tiles_y = width // 8, height // 8
-
-        for ty in range(tiles_y):
-            for tx in range(tiles_x):
-                tile_off = offset + (ty * tiles_x + tx) * 128
-                for py in range(8):
-                    for px in range(8):
-                        idx = tile_off + morton_index(px, py) * 2
-                        if idx + 2 <= len(data):
-                            a, l = data[idx:idx + 2]
-                            x = tx * 8 + px
-                            y = ty * 8 + py
-                            o = (y * width + x) * 4
-                            out[o:o + 4] = bytes((l, l, l, a))
+        l = texels[1::2]
+        out[0::4] = l
+        out[1::4] = l
+        out[2::4] = l
+        out[3::4] = texels[0::2]
         return bytes(out)
 
     def _magick_gradient_clear_draw(self):
@@ -806,20 +979,7 @@ class GBAVCBannerPatcher:
     
     def _decode_la8_texture(self, data, offset, width, height):
         """Decode LA8 Morton-tiled texture to RGBA image"""
-        img = Image.new('RGBA', (width, height))
-        pixels = img.load()
-        tiles_x, tiles_y = width // 8, height // 8
-        
-        for ty in range(tiles_y):
-            for tx in range(tiles_x):
-                tile_off = offset + (ty * tiles_x + tx) * 128
-                for py in range(8):
-                    for px in range(8):
-                        idx = tile_off + morton_index(px, py) * 2
-                        if idx + 2 <= len(data):
-                            a, l = data[idx:idx + 2]
-                            pixels[tx * 8 + px, ty * 8 + py] = (l, l, l, a)
-        return img
+        return decode_la8_morton(data, offset, width, height)
     
     def build_banner(self, output_path):
         """
@@ -837,23 +997,13 @@ class GBAVCBannerPatcher:
             """Align size to 4-byte boundary"""
             return (size + 3) & ~3
         
-        def pad_to_align4(data):
-            """Pad data to 4-byte alignment"""
-            padding_needed = (4 - (len(data) % 4)) % 4
-            return bytes(data) + b'\x00' * padding_needed
-        
-        # Compress common CGFX
-        print("  Compressing common CGFX...")
-        common_compressed = pad_to_align4(compress_lz11(bytes(self.common_cgfx)))
-        print(f"    {len(self.common_cgfx):,} -> {len(common_compressed):,} bytes (aligned)")
-        
-        # Compress all region CGFX files with alignment padding
-        print("  Compressing region CGFX files...")
-        regions_compressed = []
-        for i, region in enumerate(self.region_templates):
-            compressed = pad_to_align4(compress_lz11(bytes(region)))
-            regions_compressed.append(compressed)
-        print(f"    13 regions compressed (aligned)")
+        # Compress common and all region CGFX files with alignment padding,
+        # in parallel. The common CGFX is the largest, so it goes first.
+        print("  Compressing common and region CGFX files...")
+        common_compressed, *regions_compressed = compress_cgfx_sections(
+            [self.common_cgfx] + list(self.region_templates))
+        print(f"    Common: {len(self.common_cgfx):,} -> {len(common_compressed):,} bytes (aligned)")
+        print(f"    {len(regions_compressed)} regions compressed (aligned)")
         
         # Build CBMD header
         cbmd = bytearray(0x88)
@@ -873,20 +1023,16 @@ class GBAVCBannerPatcher:
         cwav_offset = current_offset
         struct.pack_into('<I', cbmd, 0x84, cwav_offset)
         
-        # Build final banner
-        banner = bytearray()
-        banner.extend(cbmd)
-        banner.extend(common_compressed)
-        for region_data in regions_compressed:
-            banner.extend(region_data)
-        banner.extend(self.audio)
-        
-        # Write output
+        # Write the banner section by section, without joining it first
         with open(output_path, 'wb') as f:
-            f.write(banner)
+            f.write(cbmd)
+            f.write(common_compressed)
+            for region_data in regions_compressed:
+                f.write(region_data)
+            f.write(self.audio)
         
         print(f"\nBanner created: {output_path}")
-        print(f"  Total size: {len(banner):,} bytes")
+        print(f"  Total size: {cwav_offset + len(self.audio):,} bytes")
         
         return output_path
     
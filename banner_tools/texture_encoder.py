@@ -51,6 +51,20 @@ def morton_index(x: int, y: int) -> int:
     return MORTON_TABLE_8x8[y * 8 + x]
 
 
+# Per-byte tables from 8-bit channels to RGB565 bit fields
+# (little-endian: low byte = GGGBBBBB, high byte = RRRRRGGG). These and
+# _or_bytes are also used by boot_splash and gba_vc_banner_patcher.
+_RGB565_R_HI = bytes(v & 0xF8 for v in range(256))
+_RGB565_G_HI = bytes(v >> 5 for v in range(256))
+_RGB565_G_LO = bytes((v & 0x1C) << 3 for v in range(256))
+_RGB565_B_LO = bytes(v >> 3 for v in range(256))
+
+
+def _or_bytes(x: bytes, y: bytes) -> bytes:
+    """Bitwise OR two equal-length byte strings."""
+    return (int.from_bytes(x, 'little') | int.from_bytes(y, 'little')).to_bytes(len(x), 'little')
+
+
 def get_tile_offset(tile_x: int, tile_y: int, tiles_per_row: int, bytes_per_tile: int) -> int:
     """
     Get byte offset of a tile in the texture data.
@@ -69,6 +83,39 @@ def get_tile_offset(tile_x: int, tile_y: int, tiles_per_row: int, bytes_per_tile
     return (tile_y * tiles_per_row + tile_x) * bytes_per_tile
 
 
+def _tile_morton(texels: bytes, width: int, height: int, bpp: int) -> bytes:
+    """
+    Reorder row-major texels (bpp 2 or 4) into 8x8 Morton-order tiles.
+    
+    Works one row of tiles at a time, so each pass only touches 8 image
+    rows of input and one tile row of output. Within a tile row every
+    strided slice copies one Morton slot out of all of its tiles.
+    
+    Args:
+        texels: Row-major texel bytes, width and height multiples of 8
+        width: Texture width
+        height: Texture height
+        bpp: Bytes per texel (2 or 4)
+    
+    Returns:
+        Tiled texture data bytes
+    """
+    fmt = 'H' if bpp == 2 else 'I'
+    row_texels = width * 8  # texels in one row of tiles
+    output = bytearray(width * height * bpp)
+    
+    with memoryview(texels).cast(fmt) as src, memoryview(output).cast(fmt) as dst:
+        for tile_y in range(height // 8):
+            base = tile_y * row_texels
+            for py in range(8):
+                row = (tile_y * 8 + py) * width
+                for px in range(8):
+                    morton_idx = MORTON_TABLE_8x8[py * 8 + px]
+                    dst[base + morton_idx:base + row_texels:64] = src[row + px:row + width:8]
+    
+    return bytes(output)
+
+
 def encode_la8(image: Image.Image) -> bytes:
     """
     Encode image to LA8 (Luminance + Alpha) format with Morton order tiling.
@@ -115,35 +162,11 @@ def encode_la8(image: Image.Image) -> bytes:
     # Flip Y axis (3DS textures are bottom-to-top)
     image = image.transpose(Image.FLIP_TOP_BOTTOM)
     
-    pixels = image.load()
-    
-    tiles_per_row = width // 8
-    tiles_per_col = height // 8
-    bytes_per_tile = 8 * 8 * 2  # 64 pixels * 2 bytes
+    # LA8 format: [Alpha, Luminance]
+    lum, alpha = image.split()
+    texels = Image.merge('LA', (alpha, lum)).tobytes()
     
-    output = bytearray(tiles_per_row * tiles_per_col * bytes_per_tile)
-    
-    for tile_y in range(tiles_per_col):
-        for tile_x in range(tiles_per_row):
-            tile_offset = get_tile_offset(tile_x, tile_y, tiles_per_row, bytes_per_tile)
-            
-            for py in range(8):
-                for px in range(8):
-                    # Get pixel from image
-                    img_x = tile_x * 8 + px
-                    img_y = tile_y * 8 + py
-                    
-                    lum, alpha = pixels[img_x, img_y]
-                    
-                    # Get Morton index within tile
-                    morton_idx = morton_index(px, py)
-                    pixel_offset = tile_offset + morton_idx * 2
-                    
-                    # LA8 format: [Alpha, Luminance]
-                    output[pixel_offset] = alpha
-                    output[pixel_offset + 1] = lum
-    
-    return bytes(output)
+    return _tile_morton(texels, width, height, 2)
 
 
 def encode_rgb565(image: Image.Image) -> bytes:
@@ -177,39 +200,18 @@ def encode_rgb565(image: Image.Image) -> bytes:
     # Flip Y axis
     image = image.transpose(Image.FLIP_TOP_BOTTOM)
     
-    pixels = image.load()
-    
-    tiles_per_row = width // 8
-    tiles_per_col = height // 8
-    bytes_per_tile = 8 * 8 * 2  # 64 pixels * 2 bytes
+    # Convert to RGB565 for the whole image at once: table lookups give
+    # the low (GGGBBBBB) and high (RRRRRGGG) byte of every pixel
+    r, g, b = (band.tobytes() for band in image.split())
+    lo = _or_bytes(g.translate(_RGB565_G_LO), b.translate(_RGB565_B_LO))
+    hi = _or_bytes(r.translate(_RGB565_R_HI), g.translate(_RGB565_G_HI))
     
-    output = bytearray(tiles_per_row * tiles_per_col * bytes_per_tile)
+    # Little-endian
+    texels = bytearray(width * height * 2)
+    texels[0::2] = lo
+    texels[1::2] = hi
     
-    for tile_y in range(tiles_per_col):
-        for tile_x in range(tiles_per_row):
-            tile_offset = get_tile_offset(tile_x, tile_y, tiles_per_row, bytes_per_tile)
-            
-            for py in range(8):
-                for px in range(8):
-                    img_x = tile_x * 8 + px
-                    img_y = tile_y * 8 + py
-                    
-                    r, g, b = pixels[img_x, img_y]
-                    
-                    # Convert to RGB565
-                    r5 = (r >> 3) & 0x1F
-                    g6 = (g >> 2) & 0x3F
-                    b5 = (b >> 3) & 0x1F
-                    rgb565 = (r5 << 11) | (g6 << 5) | b5
-                    
-                    morton_idx = morton_index(px, py)
-                    pixel_offset = tile_offset + morton_idx * 2
-                    
-                    # Little-endian
-                    output[pixel_offset] = rgb565 & 0xFF
-                    output[pixel_offset + 1] = (rgb565 >> 8) & 0xFF
-    
-    return bytes(output)
+    return _tile_morton(texels, width, height, 2)
 
 
 def encode_rgba8(image: Image.Image) -> bytes:
@@ -243,35 +245,10 @@ def encode_rgba8(image: Image.Image) -> bytes:
     # Flip Y axis
     image = image.transpose(Image.FLIP_TOP_BOTTOM)
     
-    pixels = image.load()
-    
-    tiles_per_row = width // 8
-    tiles_per_col = height // 8
-    bytes_per_tile = 8 * 8 * 4  # 64 pixels * 4 bytes
+    # RGBA8 format in 3DS: [A, B, G, R]
+    texels = image.tobytes('raw', 'ABGR')
     
-    output = bytearray(tiles_per_row * tiles_per_col * bytes_per_tile)
-    
-    for tile_y in range(tiles_per_col):
-        for tile_x in range(tiles_per_row):
-            tile_offset = get_tile_offset(tile_x, tile_y, tiles_per_row, bytes_per_tile)
-            
-            for py in range(8):
-                for px in range(8):
-                    img_x = tile_x * 8 + px
-                    img_y = tile_y * 8 + py
-                    
-                    r, g, b, a = pixels[img_x, img_y]
-                    
-                    morton_idx = morton_index(px, py)
-                    pixel_offset = tile_offset + morton_idx * 4
-                    
-                    # RGBA8 format in 3DS: [A, B, G, R]
-                    output[pixel_offset] = a
-                    output[pixel_offset + 1] = b
-                    output[pixel_offset + 2] = g
-                    output[pixel_offset + 3] = r
-    
-    return bytes(output)
+    return _tile_morton(texels, width, height, 4)
 
 
 def encode_etc1(image: Image.Image, with_alpha: bool = True, quality: str = 'medium') -> bytes:
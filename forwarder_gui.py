@@ -56,6 +56,12 @@ TEMPLATES = {
 
 DEFAULT_TEMPLATE = 'gba_vc'
 
+# Morton (Z-order) index of pixel (x, y) of an 8x8 tile, at [y * 8 + x]
+_MORTON_TABLE = tuple(
+    ((x & 1) | (y & 1) << 1 | (x & 2) << 1 | (y & 2) << 2 | (x & 4) << 2 | (y & 4) << 3)
+    for y in range(8) for x in range(8)
+)
+
 
 def check_docker():
     """Check if Docker is available, accessible, and image is built."""
@@ -1962,13 +1968,6 @@ class ForwarderWindow(Adw.ApplicationWindow):
     @staticmethod
     def _decode_la8_to_raw(data: bytes, offset: int, width: int, height: int) -> bytes:
         """Decode LA8 morton-tiled texture to raw RGBA bytes (no Pillow)."""
-        def morton_index(x, y):
-            morton = 0
-            for i in range(3):
-                morton |= ((x >> i) & 1) << (2 * i)
-                morton |= ((y >> i) & 1) << (2 * i + 1)
-            return morton
-
         out = bytearray(width * height * 4)
         tiles_x, tiles_y = width // 8, height // 8
         for ty in range(tiles_y):
@@ -1976,7 +1975,7 @@ class ForwarderWindow(Adw.ApplicationWindow):
                 tile_off = offset + (ty * tiles_x + tx) * 128
                 for py in range(8):
                     for px in range(8):
-                        idx = tile_off + morton_index(px, py) * 2
+                        idx = tile_off + _MORTON_TABLE[py * 8 + px] * 2
                         if idx + 1 >= len(data):
                             continue
                         a = data[idx]